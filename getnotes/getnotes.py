@@ -2,7 +2,6 @@
 import asyncio
 import ipaddress
 import logging
-import socket
 from typing import Union
 
 import aiomysql
@@ -16,6 +15,7 @@ from redbot.core.utils.chat_formatting import box, humanize_list, pagify, warnin
 from redbot.core.utils.menus import DEFAULT_CONTROLS, menu
 
 # Util Imports
+from .resolver import Resolver
 from .util import key_to_ckey
 
 __version__ = "1.2.1"
@@ -29,6 +29,7 @@ BaseCog = getattr(commands, "Cog", object)
 class GetNotes(BaseCog):
     def __init__(self, bot):
         self.bot = bot
+        self.resolver = Resolver()
         self.config = Config.get_conf(self, 3257143194, force_registration=True)
 
         default_global = {
@@ -613,7 +614,7 @@ class GetNotes(BaseCog):
     async def query_database(self, guild: discord.Guild, query: str, target: str):
         # Database options loaded from the config
         db = await self.config.guild(guild).mysql_db()
-        db_host = socket.gethostbyname(await self.config.guild(guild).mysql_host())
+        db_host = await self.resolver.resolve(await self.config.guild(guild).mysql_host())
         db_port = await self.config.guild(guild).mysql_port()
         db_user = await self.config.guild(guild).mysql_user()
         db_pass = await self.config.guild(guild).mysql_password()
@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+
+class SnapshotCache:
+    """
+    Caches the results of server queries for a short time
+
+    Concurrent lookups for the same key share a single in-flight request rather than each querying the server.
+    """
+
+    def __init__(self, ttl: float = 0):
+        self.ttl = ttl
+        self._entries = {} #key: (time fetched, value)
+        self._inflight = {} #key: task fetching the value
+
+    async def get(self, key, factory):
+        """
+        Returns the cached value for the key, calling `factory()` to fetch it if it's missing or stale
+        """
+        entry = self._entries.get(key)
+        if entry is not None and (time.monotonic() - entry[0]) < self.ttl:
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, factory))
+            self._inflight[key] = task
+
+        return await asyncio.shield(task) #One impatient caller shouldn't cancel the request for everyone else
+
+    async def _fetch(self, key, factory):
+        try:
+            value = await factory()
+            self._entries[key] = (time.monotonic(), value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def invalidate(self):
+        self._entries.clear()
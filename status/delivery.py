@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+import discord
+
+log = logging.getLogger("red.SS13Status")
+
+MAX_EMBEDS = 10 #Discord's limits for a single message
+MAX_EMBED_CHARS = 6000
+RETRY_DELAYS = (1, 2, 5, 10, 30, 60, 120, 300, 300, 300) #About 19 minutes in total before giving up
+FAN_OUT_CONCURRENCY = 25 #Sends in flight at once, kept well under Discord's global limit of 50 requests per second
+
+
+class NotificationQueue:
+    """
+    Queues embeds bound for Discord and sends them in batches
+
+    Embeds queued within a short window of each other are grouped by channel and sent together, up to 10 per
+    message, so a burst of tickets costs a handful of API calls instead of one per ticket. Each channel is sent to
+    by its own task, so a channel Discord keeps failing for (and retrying) doesn't hold up the others.
+    """
+
+    def __init__(self, maxsize: int = 1000, window: float = 1.5, send_latency=None, dropped=None, concurrency: int = FAN_OUT_CONCURRENCY):
+        self.queue = asyncio.Queue(maxsize)
+        self.window = window
+        self.send_latency = send_latency #Optional metrics
+        self.dropped = dropped
+        self.concurrency = concurrency
+        self._worker = None
+        self._senders = {} #channel id: (task, entries waiting for it) for channels with a send in progress
+        self._semaphore = None
+
+    def start(self):
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+        for task, _ in list(self._senders.values()):
+            task.cancel()
+
+    def put(self, channel: discord.abc.Messageable, embed: discord.Embed) -> asyncio.Future:
+        """
+        Queues an embed to be sent to the channel
+
+        Returns a future that's set to True once the embed has been sent, or False if it couldn't be (including when
+        the queue is full and the embed was dropped).
+        """
+        done = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((channel, embed, done))
+        except asyncio.QueueFull:
+            if self.dropped is not None:
+                self.dropped.inc()
+            log.warning(f"The notification queue is full, dropping a message bound for #{channel}")
+            done.set_result(False)
+        return done
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                self.deliver(batch)
+            except Exception as e:
+                log.exception(f"Unable to deliver notifications: {e}")
+
+    def deliver(self, batch: list):
+        """
+        Hands a batch of (channel, embed, future) entries to each channel's sender without waiting for them to be sent
+
+        Each channel's embeds are sent in the order they were queued. Embeds for a channel that's still sending an
+        earlier batch are sent once it's done.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        channels = {}
+        for channel, embed, done in batch:
+            channels.setdefault(channel.id, (channel, []))[1].append((embed, done))
+
+        for channel_id, (channel, entries) in channels.items():
+            sender = self._senders.get(channel_id)
+            if sender is not None:
+                sender[1].extend(entries)
+            else:
+                self._senders[channel_id] = (asyncio.ensure_future(self._sender(channel, entries)), entries)
+
+    async def _sender(self, channel, waiting: list):
+        entries = []
+        try:
+            while waiting:
+                entries = waiting[:]
+                waiting.clear()
+                async with self._semaphore:
+                    await self._send(channel, entries)
+        finally:
+            del self._senders[channel.id]
+            for _, done in entries + waiting: #Only left unresolved when the queue was stopped mid-send
+                if not done.done():
+                    done.set_result(False)
+
+    async def _send(self, channel, entries: list):
+        futures = iter(done for _, done in entries)
+        for chunk in chunk_embeds([embed for embed, _ in entries]):
+            try:
+                start = time.perf_counter()
+                await send_with_retry(channel, embeds=chunk)
+                if self.send_latency is not None:
+                    self.send_latency.observe(time.perf_counter() - start)
+                delivered = True
+            except discord.DiscordException as e:
+                log.warning(f"Unable to send {len(chunk)} notification(s) to #{channel}: {e}")
+                delivered = False
+            except Exception as e: #Still unable to reach Discord after every retry
+                log.warning(f"Unable to send {len(chunk)} notification(s) to #{channel}: {e!r}")
+                delivered = False
+            for _ in chunk:
+                done = next(futures)
+                if not done.done(): #The handler waiting on it may have been cancelled
+                    done.set_result(delivered)
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Whether a failed send is worth retrying (Discord having trouble or the connection dropping) rather than permanent (e.g. missing permissions)
+    """
+    if isinstance(error, discord.HTTPException):
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, (OSError, asyncio.TimeoutError, aiohttp.ClientError))
+
+
+async def send_with_retry(channel: discord.abc.Messageable, **kwargs) -> discord.Message:
+    """
+    Sends a message, retrying with increasing delays while Discord is unavailable
+
+    Permanent errors, and transient ones that outlast every retry, are raised.
+    """
+    for delay in RETRY_DELAYS:
+        try:
+            return await channel.send(**kwargs)
+        except Exception as e:
+            if not is_transient(e):
+                raise
+            log.info(f"Unable to reach Discord to send to #{channel}, retrying in {delay} seconds: {e!r}")
+            await asyncio.sleep(delay)
+    return await channel.send(**kwargs)
+
+
+async def fan_out(messages: list, concurrency: int = FAN_OUT_CONCURRENCY, send_latency=None) -> int:
+    """
+    Sends a message to many channels at once, returning how many were delivered
+
+    Each item is a (channel, send kwargs) pair. Every channel is its own route, so discord.py's per-route rate limit
+    handling lets the sends run side by side, concurrency only caps how many are in flight against the global limit.
+    Messages for the same channel are sent one after another, in order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    channels = {}
+    for channel, kwargs in messages:
+        channels.setdefault(channel.id, (channel, []))[1].append(kwargs)
+
+    async def send(channel, queued: list) -> int:
+        delivered = 0
+        for kwargs in queued:
+            async with semaphore:
+                try:
+                    start = time.perf_counter()
+                    await send_with_retry(channel, **kwargs)
+                    if send_latency is not None:
+                        send_latency.observe(time.perf_counter() - start)
+                    delivered += 1
+                except discord.DiscordException as e:
+                    log.warning(f"Unable to send a notification to #{channel}: {e}")
+                except Exception as e: #Still unable to reach Discord after every retry
+                    log.warning(f"Unable to send a notification to #{channel}: {e!r}")
+        return delivered
+
+    return sum(await asyncio.gather(*(send(channel, queued) for channel, queued in channels.values())))
+
+
+def chunk_embeds(embeds: list) -> list:
+    """
+    Splits embeds into groups that fit within a single message
+    """
+    chunks = []
+    current = []
+    size = 0
+    for embed in embeds:
+        if current and (len(current) >= MAX_EMBEDS or size + len(embed) > MAX_EMBED_CHARS):
+            chunks.append(current)
+            current = []
+            size = 0
+        current.append(embed)
+        size += len(embed)
+    if current:
+        chunks.append(current)
+    return chunks
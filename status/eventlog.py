@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger("red.SS13Status")
+
+#Events from the main server are logged with a server of '', added servers use their name
+TABLES = """
+CREATE TABLE IF NOT EXISTS rounds (
+    server TEXT NOT NULL DEFAULT '',
+    round_id TEXT NOT NULL,
+    started REAL NOT NULL,
+    PRIMARY KEY (server, round_id)
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    round_id TEXT,
+    type TEXT NOT NULL,
+    message TEXT,
+    server TEXT NOT NULL DEFAULT '',
+    seq INTEGER
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS rounds_server_started ON rounds (server, started);
+CREATE INDEX IF NOT EXISTS events_server_timestamp ON events (server, timestamp, type);
+CREATE INDEX IF NOT EXISTS events_server_round ON events (server, round_id, type);
+CREATE UNIQUE INDEX IF NOT EXISTS events_seq ON events (seq, timestamp);
+"""
+
+#Logs created before servers were tracked only had a single server
+MIGRATIONS = """
+ALTER TABLE events ADD COLUMN server TEXT NOT NULL DEFAULT '';
+DROP INDEX IF EXISTS events_timestamp;
+DROP INDEX IF EXISTS events_round;
+ALTER TABLE rounds RENAME TO rounds_old;
+CREATE TABLE rounds (
+    server TEXT NOT NULL DEFAULT '',
+    round_id TEXT NOT NULL,
+    started REAL NOT NULL,
+    PRIMARY KEY (server, round_id)
+);
+INSERT INTO rounds (round_id, started) SELECT round_id, started FROM rounds_old;
+DROP TABLE rounds_old;
+"""
+
+#Events replayed from the spool are logged with their sequence number, so one that's replayed after it was logged isn't logged twice
+SEQ_MIGRATION = "ALTER TABLE events ADD COLUMN seq INTEGER;"
+
+TICKET_TYPES = ("admin_ticket", "mentor_ticket")
+MAX_ROUND_LENGTH = 43200 #Gaps between round starts longer than this are downtime, not a round
+
+
+class EventLog:
+    """
+    Keeps a log of round starts and game notices in a local SQLite database
+
+    Events are buffered in memory and written in batches by a background task. All database work happens on a
+    single worker thread so the event loop never waits on disk.
+    """
+
+    def __init__(self, path, flush_interval: float = 2.0, batch_size: int = 500):
+        self.path = str(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = []
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ss13status-eventlog")
+        self._db = None
+        self._writer = None
+        self._closed = False
+
+    def start(self):
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.ensure_future(self._run())
+
+    async def close(self):
+        """
+        Writes any buffered events and closes the database
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+        await self.flush()
+        await self._call(self._close)
+        self._executor.shutdown(wait=False)
+
+    def log(self, event_type: str, round_id: str = None, message: str = None, timestamp: float = None, server: str = None, seq: int = None):
+        """
+        Buffers an event to be written with the next batch
+
+        Events logged with a sequence number are only written once, however many times they're logged with it and the same timestamp.
+        """
+        self._pending.append((timestamp or time.time(), round_id, event_type, message, server or "", seq))
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            await self._call(self._write, batch)
+        except sqlite3.Error as e:
+            log.warning(f"Unable to write {len(batch)} event(s) to the round log: {e}")
+
+    async def round_stats(self, days: int, server: str = None) -> dict:
+        return await self._call(self._round_stats, time.time() - (days * 86400), server or "")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _call(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    #Everything below runs on the worker thread
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(TABLES)
+            columns = {column[1] for column in self._db.execute("PRAGMA table_info(events)")}
+            if "server" not in columns:
+                self._db.executescript(f"BEGIN; {MIGRATIONS} COMMIT;")
+            if "seq" not in columns:
+                self._db.executescript(f"BEGIN; {SEQ_MIGRATION} COMMIT;")
+            self._db.executescript(INDEXES)
+        return self._db
+
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _write(self, batch: list):
+        db = self._connect()
+        with db:
+            db.executemany("INSERT OR IGNORE INTO events (timestamp, round_id, type, message, server, seq) VALUES (?, ?, ?, ?, ?, ?)", batch)
+            db.executemany(
+                "INSERT OR IGNORE INTO rounds (server, round_id, started) VALUES (?, ?, ?)",
+                [(server, round_id, timestamp) for timestamp, round_id, event_type, _, server, _ in batch if event_type == "round_start" and round_id is not None]
+            )
+
+    def _round_stats(self, since: float, server: str) -> dict:
+        db = self._connect()
+        per_day = db.execute(
+            "SELECT date(started, 'unixepoch') AS day, COUNT(*) FROM rounds WHERE server = ? AND started >= ? GROUP BY day ORDER BY day", (server, since)
+        ).fetchall()
+        average_duration = db.execute(
+            "SELECT AVG(duration) FROM ("
+            "SELECT LEAD(started) OVER (ORDER BY started) - started AS duration FROM rounds WHERE server = ? AND started >= ?"
+            ") WHERE duration IS NOT NULL AND duration < ?", (server, since, MAX_ROUND_LENGTH)
+        ).fetchone()[0]
+        tickets = dict(db.execute(
+            f"SELECT type, COUNT(*) FROM events WHERE server = ? AND timestamp >= ? AND type IN ({','.join('?' * len(TICKET_TYPES))}) GROUP BY type",
+            (server, since, *TICKET_TYPES)
+        ).fetchall())
+        busiest = db.execute(
+            "SELECT events.round_id, COUNT(*) AS tickets FROM rounds JOIN events ON events.server = rounds.server AND events.round_id = rounds.round_id "
+            f"WHERE rounds.server = ? AND rounds.started >= ? AND events.type IN ({','.join('?' * len(TICKET_TYPES))}) "
+            "GROUP BY events.round_id ORDER BY tickets DESC LIMIT 1", (server, since, *TICKET_TYPES)
+        ).fetchone()
+
+        return {
+            "per_day": per_day,
+            "rounds": sum(count for _, count in per_day),
+            "average_duration": average_duration,
+            "tickets": tickets,
+            "busiest_round": busiest,
+        }
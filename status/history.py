@@ -0,0 +1,76 @@
+from array import array
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+class StatusHistory:
+    """
+    Fixed-size ring buffer of server status samples
+
+    Each field is kept in its own typed array, so a week of samples takes up a few dozen kilobytes.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.online = array('B', bytes(capacity))
+        self.players = array('H', bytes(2 * capacity))
+        self.admins = array('H', bytes(2 * capacity))
+        self.durations = array('L', bytes(array('L').itemsize * capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def record(self, timestamp: float, players: int = 0, admins: int = 0, duration: int = 0, online: bool = True):
+        i = self._next
+        self.timestamps[i] = timestamp
+        self.online[i] = online
+        self.players[i] = min(max(players, 0), 0xFFFF)
+        self.admins[i] = min(max(admins, 0), 0xFFFF)
+        self.durations[i] = max(duration, 0)
+
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def since(self, timestamp: float) -> list:
+        """
+        Returns (timestamp, online, players, admins, duration) tuples recorded after the timestamp, oldest first
+        """
+        start = (self._next - self._size) % self.capacity
+        samples = []
+        for n in range(self._size):
+            i = (start + n) % self.capacity
+            if self.timestamps[i] >= timestamp:
+                samples.append((self.timestamps[i], bool(self.online[i]), self.players[i], self.admins[i], self.durations[i]))
+        return samples
+
+
+def sparkline(values: list, width: int = 48) -> str:
+    """
+    Renders the values as a line of block characters, using the peak value of each column
+
+    Values of None (e.g. the server being offline) are drawn as a blank space.
+    """
+    if not values:
+        return ""
+
+    columns = []
+    step = max(len(values) / width, 1)
+    position = 0.0
+    while int(position) < len(values):
+        bucket = [v for v in values[int(position):int(position + step)] if v is not None]
+        columns.append(max(bucket) if bucket else None)
+        position += step
+
+    peak = max((v for v in columns if v is not None), default=0)
+    line = ""
+    for value in columns:
+        if value is None:
+            line += " "
+        elif peak == 0:
+            line += SPARK_CHARS[0]
+        else:
+            line += SPARK_CHARS[round(value / peak * (len(SPARK_CHARS) - 1))]
+    return line
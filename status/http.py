@@ -0,0 +1,134 @@
+import asyncio
+import urllib.parse
+
+MAX_HEADER_SIZE = 16384
+MAX_BODY_SIZE = 65536
+KEEPALIVE_TIMEOUT = 30
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    505: "HTTP Version Not Supported",
+}
+
+
+class HTTPError(Exception):
+    """
+    Raised when a request can't be parsed, the status is sent back to the client before closing the connection
+    """
+
+    def __init__(self, status: int, message: str = None):
+        super().__init__(message or REASONS.get(status, ""))
+        self.status = status
+
+
+class Request:
+    __slots__ = ("method", "target", "version", "headers", "body")
+
+    def __init__(self, method: str, target: str, version: str, headers: dict, body: bytes):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def path(self) -> str:
+        return urllib.parse.urlsplit(self.target).path
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def params(self) -> dict:
+        """
+        Parses the query string (and any form encoded body) into a dict of lists
+        """
+        query = urllib.parse.urlsplit(self.target).query
+        if self.body and self.headers.get("content-type", "").startswith("application/x-www-form-urlencoded"):
+            query = f"{query}&{self.body.decode()}" if query else self.body.decode()
+        return urllib.parse.parse_qs(query)
+
+
+async def read_request(reader: asyncio.StreamReader, timeout: float = KEEPALIVE_TIMEOUT) -> Request:
+    """
+    Reads the next request from the connection, returning None once the client is done sending requests
+
+    Partial reads are buffered by the stream reader, so a request split across several packets (or several
+    requests sent back to back) are read one at a time.
+    """
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise HTTPError(400, "Incomplete request")
+        return None #Connection closed between requests
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431)
+    except asyncio.TimeoutError:
+        return None #Idle keep-alive connection
+    if len(head) > MAX_HEADER_SIZE:
+        raise HTTPError(431)
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HTTPError(400, f"Malformed request line: {lines[0]!r}")
+    if version not in ("HTTP/1.0", "HTTP/1.1"):
+        raise HTTPError(505)
+
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise HTTPError(400, f"Malformed header: {line!r}")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HTTPError(400, "Chunked requests are not supported")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(413)
+
+    try:
+        body = await asyncio.wait_for(reader.readexactly(length), timeout) if length else b""
+    except asyncio.IncompleteReadError:
+        raise HTTPError(400, "Incomplete request body")
+    except asyncio.TimeoutError:
+        raise HTTPError(408)
+
+    return Request(method, target, version, headers, body)
+
+
+def write_response(writer: asyncio.StreamWriter, status: int, body: str = None, keep_alive: bool = True, content_type: str = "text/plain; charset=utf-8"):
+    """
+    Queues a response on the connection, the caller is responsible for draining the writer
+    """
+    payload = (body if body is not None else REASONS.get(status, "")).encode()
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    writer.write(head.encode() + payload)
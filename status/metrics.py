@@ -0,0 +1,127 @@
+import bisect
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _labels(names: tuple, values: tuple, extra: str = None) -> str:
+    pairs = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, description: str, labels: tuple = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{_labels(self.labels, labels)} {value}")
+        return lines
+
+
+class Gauge:
+    """
+    A gauge whose value is read from a callback whenever the metrics are rendered
+    """
+
+    def __init__(self, name: str, description: str, callback):
+        self.name = name
+        self.description = description
+        self.callback = callback
+
+    def render(self) -> list:
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} gauge", f"{self.name} {self.callback()}"]
+
+
+class Histogram:
+    """
+    Counts observations into fixed buckets, keeping one set of buckets per combination of labels
+    """
+
+    def __init__(self, name: str, description: str, buckets: tuple = LATENCY_BUCKETS, labels: tuple = ()):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.labels = labels
+        self.series = {} #labels: [bucket counts (+inf last), sum, count]
+
+    def observe(self, value: float, *labels):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *labels) -> int:
+        series = self.series.get(labels)
+        return series[2] if series is not None else 0
+
+    def quantile(self, q: float, *labels) -> float:
+        """
+        Estimates a quantile (0-1) by interpolating within the bucket it falls in, returns None without observations
+
+        Observations beyond the largest bucket are reported as the largest bucket's upper bound.
+        """
+        series = self.series.get(labels)
+        if series is None or series[2] == 0:
+            return None
+
+        rank = q * series[2]
+        cumulative = 0
+        for i, bucket_count in enumerate(series[0]):
+            if bucket_count and cumulative + bucket_count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i > 0 else 0
+                return lower + (self.buckets[i] - lower) * ((rank - cumulative) / bucket_count)
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labels, labels)} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Holds the cog's metrics and renders them in the Prometheus text format
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name: str, description: str, labels: tuple = ()) -> Counter:
+        return self._register(Counter(name, description, labels))
+
+    def gauge(self, name: str, description: str, callback) -> Gauge:
+        return self._register(Gauge(name, description, callback))
+
+    def histogram(self, name: str, description: str, buckets: tuple = LATENCY_BUCKETS, labels: tuple = ()) -> Histogram:
+        return self._register(Histogram(name, description, buckets, labels))
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
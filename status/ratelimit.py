@@ -0,0 +1,44 @@
+import time
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter keyed by anything hashable (e.g. a channel and event type)
+
+    Each key may be allowed `burst` times in a row, regaining one allowance every `period / burst` seconds.
+    Checking a key never waits, it simply reports whether the action is allowed right now.
+    """
+
+    def __init__(self, burst: int = 1, period: float = 300):
+        self.burst = burst
+        self.period = period
+        self._buckets = {}
+
+    def configure(self, burst: int, period: float):
+        if (burst, period) != (self.burst, self.period):
+            self.burst = burst
+            self.period = period
+            self._buckets.clear()
+
+    def allow(self, key) -> bool:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.burst, now)
+        else:
+            rate = self.burst / self.period if self.period > 0 else float("inf")
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * rate)
+            bucket.updated = now
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return True
+        return False
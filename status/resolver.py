@@ -0,0 +1,43 @@
+import asyncio
+import socket
+import time
+
+
+class Resolver:
+    """
+    Resolves hostnames without blocking the event loop, caching the results
+
+    Failed lookups are cached for a shorter time so a bad hostname doesn't cause a lookup on every request.
+    """
+
+    def __init__(self, ttl: float = 300, negative_ttl: float = 30):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._cache = {}  # host: (expiry time, address or error args)
+
+    async def resolve(self, host: str) -> str:
+        """
+        Returns the IPv4 address for a host, raising socket.gaierror if it can't be resolved
+        """
+        if not isinstance(host, str):
+            raise TypeError(f"Expected a hostname, got {type(host).__name__}")
+
+        now = time.monotonic()
+        entry = self._cache.get(host)
+        if entry is not None and entry[0] > now:
+            if isinstance(entry[1], tuple):
+                raise socket.gaierror(*entry[1])
+            return entry[1]
+
+        try:
+            addresses = await asyncio.get_running_loop().getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            self._cache[host] = (now + self.negative_ttl, e.args)
+            raise
+
+        address = addresses[0][4][0]
+        self._cache[host] = (now + self.ttl, address)
+        return address
+
+    def clear(self):
+        self._cache.clear()
@@ -0,0 +1,83 @@
+def _first(value):
+    #Legacy topics decode into lists of strings, JSON topics into plain values
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _int(value, default: int = 0) -> int:
+    value = _first(value)
+    if value is None or value == "":
+        return default
+    return int(float(value)) #Byond sends some numbers as floats (e.g. "3.0")
+
+
+def _str(value, default: str = None) -> str:
+    value = _first(value)
+    return default if value is None else str(value)
+
+
+class StatusSnapshot:
+    """
+    The server's reply to a ?status topic, decoded once into typed fields
+
+    The fields used by the status embed, channel topic, and player history are decoded up front. Everything else
+    the server reports (version, mode, revision, etc.) is kept as-is and only decoded the first time it's read.
+    Raises ValueError if the reply can't be decoded or isn't a status reply at all.
+    """
+
+    __slots__ = ("players", "admins", "round_duration", "map_name", "security_level", "shuttle_mode", "shuttle_timer", "_raw", "_extra")
+
+    #Rarely used fields, decoded on first access
+    LAZY_FIELDS = {
+        "version": _str,
+        "mode": _str,
+        "respawn": _int,
+        "enter": _int,
+        "vote": _int,
+        "ai": _int,
+        "host": _str,
+        "active_players": _int,
+        "revision": _str,
+        "revision_date": _str,
+        "gamestate": _int,
+    }
+
+    CORE_FIELDS = ("players", "admins", "round_duration", "map_name")
+
+    def __init__(self, data: dict):
+        if not isinstance(data, dict) or not any(field in data for field in StatusSnapshot.CORE_FIELDS):
+            raise ValueError(f"Not a status reply: {data!r}")
+        try:
+            self.players = _int(data.get('players'))
+            self.admins = _int(data.get('admins'))
+            self.round_duration = _int(data.get('round_duration'))
+            self.map_name = _str(data.get('map_name'), "Unknown")
+            self.security_level = _str(data.get('security_level'), "Unknown")
+            self.shuttle_mode = _str(data.get('shuttle_mode'))
+            self.shuttle_timer = _int(data.get('shuttle_timer'))
+        except (TypeError, AttributeError) as e:
+            raise ValueError(f"Unable to decode the server's status: {e}")
+        self._raw = data
+        self._extra = {}
+
+    def __getattr__(self, name):
+        decode = StatusSnapshot.LAZY_FIELDS.get(name)
+        if decode is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        if name not in self._extra:
+            try:
+                self._extra[name] = decode(self._raw.get(name))
+            except (TypeError, ValueError):
+                self._extra[name] = None
+        return self._extra[name]
+
+    def __repr__(self):
+        return f"<StatusSnapshot players={self.players} admins={self.admins} map_name={self.map_name!r} round_duration={self.round_duration}>"
+
+    @property
+    def crew(self) -> int:
+        """
+        Players that aren't admins (the server counts admins as players)
+        """
+        return self.players - self.admins
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import logging
+import os
+import pathlib
+
+log = logging.getLogger("red.SS13Status")
+
+SEGMENT_BYTES = 4 * 1024 * 1024
+SYNC_INTERVAL = 0.05
+
+
+class Spool:
+    """
+    An append-only log of incoming game events, kept on disk until they've been delivered
+
+    Events are appended to segment files and handed to a consumer in order. Writes are fsynced in batches (every
+    50ms by default) rather than once per event, so appending is about as cheap as queueing in memory. The consumer
+    acknowledges each event once it has been handled. Anything not yet acknowledged when the bot stops is replayed
+    the next time the spool is opened, so events may be handled more than once but are never lost. Segments are
+    deleted once every event in them has been acknowledged.
+
+    Each line of a segment is a JSON object with the event's sequence number and its record.
+    """
+
+    def __init__(self, path, segment_bytes: int = SEGMENT_BYTES, sync_interval: float = SYNC_INTERVAL):
+        self.path = pathlib.Path(path)
+        self.segment_bytes = segment_bytes
+        self.sync_interval = sync_interval
+        self.queue = asyncio.Queue() #(sequence, record) waiting for the consumer
+        self._segments = [] #(first sequence, path), oldest first. The last one is being written to
+        self._file = None
+        self._next_seq = 1
+        self._committed = 0 #Every event up to and including this one has been acknowledged
+        self._saved = 0 #Last committed sequence written to the checkpoint file
+        self._acked = set() #Acknowledged events past the committed one
+        self._dirty = asyncio.Event()
+        self._syncer = None
+
+    @property
+    def checkpoint_path(self) -> pathlib.Path:
+        return self.path / "checkpoint"
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def start(self):
+        """
+        Opens the spool, queueing any events that weren't acknowledged before it was last closed
+        """
+        if self._file is not None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        try:
+            self._committed = self._saved = int(self.checkpoint_path.read_text())
+        except (OSError, ValueError):
+            self._committed = self._saved = 0
+
+        replayed = 0
+        for segment in sorted(self.path.glob("*.log")):
+            first = None
+            with open(segment, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        log.warning(f"Skipping a damaged entry in the event spool ({segment.name})") #Most likely a write cut short by a crash
+                        continue
+                    first = entry['seq'] if first is None else first
+                    self._next_seq = max(self._next_seq, entry['seq'] + 1)
+                    if entry['seq'] > self._committed:
+                        self.queue.put_nowait((entry['seq'], entry['record']))
+                        replayed += 1
+            self._segments.append((first if first is not None else self._next_seq, segment))
+        if replayed:
+            log.info(f"Replaying {replayed} undelivered game event(s) from the spool")
+
+        self._next_seq = max(self._next_seq, self._committed + 1)
+        self._open_segment()
+        self._syncer = asyncio.ensure_future(self._run())
+
+    def close(self):
+        """
+        Writes everything to disk and closes the spool
+        """
+        if self._syncer is not None:
+            self._syncer.cancel()
+            self._syncer = None
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def append(self, record: dict) -> int:
+        """
+        Adds an event to the spool and queues it for the consumer, returning its sequence number
+
+        The event is written straight away, but only fsynced with the next batch. Raises OSError if it can't be written.
+        The spool must be open (see `closed`).
+        """
+        seq = self._next_seq
+        self._file.write(json.dumps({"seq": seq, "record": record}, separators=(",", ":")).encode() + b"\n")
+        self._next_seq += 1
+        self.queue.put_nowait((seq, record))
+        self._dirty.set()
+        return seq
+
+    async def get(self) -> tuple:
+        """
+        Waits for the next event, returning (sequence, record)
+        """
+        return await self.queue.get()
+
+    def ack(self, seq: int):
+        """
+        Marks an event as handled so it won't be replayed
+        """
+        if seq <= self._committed:
+            return
+        self._acked.add(seq)
+        while self._committed + 1 in self._acked:
+            self._committed += 1
+            self._acked.remove(self._committed)
+        self._dirty.set()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.sync_interval) #Let a batch of events build up
+            self._dirty.clear()
+            try:
+                self._file.flush()
+                await loop.run_in_executor(None, os.fsync, self._file.fileno())
+                await loop.run_in_executor(None, self._checkpoint)
+                if self._file.tell() >= self.segment_bytes:
+                    self._file.close()
+                    self._open_segment()
+                self._remove_delivered()
+            except OSError as e:
+                log.warning(f"Unable to write the event spool to disk: {e}")
+
+    def _sync(self):
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._checkpoint()
+            self._remove_delivered()
+        except OSError as e:
+            log.warning(f"Unable to write the event spool to disk: {e}")
+
+    def _open_segment(self):
+        segment = self.path / f"{self._next_seq:016d}.log"
+        self._file = open(segment, "ab")
+        if not self._segments or self._segments[-1][1] != segment:
+            self._segments.append((self._next_seq, segment))
+
+    def _checkpoint(self):
+        committed = self._committed
+        if committed == self._saved:
+            return
+        temp = self.checkpoint_path.with_suffix(".tmp")
+        temp.write_text(str(committed))
+        os.replace(temp, self.checkpoint_path)
+        self._saved = committed
+
+    def _remove_delivered(self):
+        #A segment is done with once the next one starts at or before the first unacknowledged event
+        while len(self._segments) > 1 and self._segments[1][0] <= self._saved + 1:
+            _, segment = self._segments.pop(0)
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
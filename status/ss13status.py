@@ -1,34 +1,87 @@
 #Standard Imports
 import asyncio
-import struct
-import socket
 import urllib.parse
-import html.parser as htmlparser
+import html
 import time
+import random
 import textwrap
 from datetime import datetime
 import logging
 import json
+import os
+import contextlib
 
 #Discord Imports
 import discord
 
 #Redbot Imports
 from redbot.core import commands, checks, Config
+from redbot.core.data_manager import cog_data_path
+from redbot.core.utils.chat_formatting import box, humanize_timedelta, pagify
+
+#Util Imports
+from .cache import SnapshotCache
+from .delivery import NotificationQueue, fan_out, send_with_retry
+from .eventlog import EventLog
+from .history import StatusHistory, sparkline
+from .ratelimit import RateLimiter
+from .http import HTTPError, read_request, write_response
+from .metrics import Registry
+from .resolver import Resolver
+from .snapshot import StatusSnapshot
+from .spool import Spool
+from .topic import topic_query
 
 __version__ = "1.1.0"
 __author__ = "Crossedfall"
 
 log = logging.getLogger("red.SS13Status")
 
+CHECK_INTERVAL = 60 #Seconds between background checks while the server is up
+MAX_CHECK_BACKOFF = 1800
+TOPIC_EDIT_INTERVAL = 300 #Discord only allows a couple of topic edits every 10 minutes
+HISTORY_INTERVAL = 300
+HISTORY_SAMPLES = 2016 #One week of samples at 5 minute intervals
+MAX_CONCURRENT_QUERIES = 10
+MAX_SPOOLED_HANDLERS = 500 #Kept below the notification queue's size so spooled messages are never dropped
+ROUND_ANNOUNCE_EXPIRY = 300 #New rounds that arrived longer ago than this (e.g. replayed after an outage) aren't announced
+LIST_FIELDS = {"whoIs": "players", "getAdmins": "admins"} #Replies that are a list of names rather than single values
+UNKNOWN_KEY = object() #Comms key lookups that didn't match any server
+
 class SS13Status(commands.Cog):
 
     def __init__(self, bot):
-        self.serv = None #Will be the task responsible for incoming game data
-        self.antispam = 0 #Used to prevent @here mention spam
+        self.serv = None #Will be the task that starts listening for incoming game data
+        self.servers = [] #(server, (host, port) or unix socket path, socket inode) for each listening server
+        self.ping_limiter = RateLimiter() #Used to prevent @here mention spam
         self.statusmsg = None #Used to delete the status message
-        self.newroundmsg = None #Used to delete the new round notification
-        self.roundID = None
+        self.newroundmsgs = {} #Server name (None for the main server): its last new round notification, so it can be deleted
+        self.round_ids = {} #Server name (None for the main server): its current round ID
+        self.key_routes = {} #Comms key: the name of the server using it (None for the main server)
+        self.handlers = set() #Tasks handling incoming game data
+        self.handler_slots = asyncio.Semaphore(MAX_SPOOLED_HANDLERS)
+        self.metrics = Registry()
+        self.events_received = self.metrics.counter("ss13_events_total", "Authenticated messages received from the game server", ("type",))
+        self.auth_failures = self.metrics.counter("ss13_auth_failures_total", "Messages dropped for a missing or incorrect comms key")
+        self.http_requests = self.metrics.counter("ss13_http_requests_total", "Requests served by the listener", ("status",))
+        self.discord_latency = self.metrics.histogram("ss13_discord_send_seconds", "Time taken to send notifications to Discord")
+        self.topic_latency = self.metrics.histogram("ss13_topic_query_seconds", "Round trip time of topic queries to the game server", labels=("query",))
+        self.topic_failures = self.metrics.counter("ss13_topic_failures_total", "Topic queries that timed out or failed to connect", ("query",))
+        self.topic_timeouts = self.metrics.counter("ss13_topic_timeouts_total", "Topic queries that exceeded the configured timeout", ("query",))
+        self.topic_phases = self.metrics.histogram("ss13_topic_phase_seconds", "Time spent in each phase of a topic query", labels=("phase",))
+        self.notifications = NotificationQueue( #Batches ticket embeds bound for Discord
+            send_latency=self.discord_latency,
+            dropped=self.metrics.counter("ss13_notifications_dropped_total", "Notifications dropped because the queue was full")
+        )
+        self.metrics.gauge("ss13_notification_queue_depth", "Notifications waiting to be sent to Discord", self.notifications.queue.qsize)
+        self.cached_settings = None #Snapshot of the config used by the listener, cleared by setstatus
+        self.cached_subscriptions = None #Snapshot of the guild round subscriptions, cleared by roundsubscribe
+        self.eventlog = EventLog(cog_data_path(self) / "events.db")
+        self.spool = Spool(cog_data_path(self) / "spool") #Incoming game data waiting to be delivered
+        self.snapshots = SnapshotCache() #Shared by every command querying the game server
+        self.history = StatusHistory(HISTORY_SAMPLES)
+        self.resolver = Resolver()
+        self.player_sessions = {} #ckey: time they were first seen on the server, kept by the join/leave tracker
 
         self.bot = bot
         self.config = Config.get_conf(self, 3257193194, force_registration=True)
@@ -44,22 +97,76 @@ class SS13Status(commands.Cog):
             "mention_role": None,
             "comms_key": "default_pwd",
             "listen_port": 8081,
+            "listen_host": "0.0.0.0", #None disables the TCP listener
+            "listen_socket": None, #Path of a unix socket to listen on as well
             "timeout": 10,
+            "cache_ttl": 15,
             "topic_toggle": False,
-            "legacy_topics": True
+            "legacy_topics": True,
+            "ping_burst": 1,
+            "ping_period": 300,
+            "metrics": False,
+            "join_leave_channel": None,
+            "join_leave_interval": 60,
+            "status_boards": {}, #channel id: message id
+            "board_interval": 60,
+            "servers": {}
         }
 
         self.config.register_global(**default_global)
-        self.serv = bot.loop.create_task(self.listener())
+        self.config.register_guild(round_channel=None, round_role=None) #Other servers subscribed to new round announcements
+        self.notifications.start()
+        self.eventlog.start()
+        self.spool.start()
+        self.serv = bot.loop.create_task(self.start_listener())
         self.svr_chk_task = self.bot.loop.create_task(self.server_check_loop())
+        self.tracker_task = self.bot.loop.create_task(self.player_tracker_loop())
+        self.board_task = self.bot.loop.create_task(self.status_board_loop())
+        self.spool_task = self.bot.loop.create_task(self.spool_worker())
     
     def cog_unload(self):
         self.serv.cancel()
+        self.close_servers(self.servers) #Closed right away so a reloaded cog can listen on the same port
+        self.servers = []
+        self.tracker_task.cancel()
+        self.board_task.cancel()
+        self.spool_task.cancel()
+        for task in list(self.handlers): #Anything still being delivered stays in the spool for next time
+            task.cancel()
+        self.notifications.stop()
+        asyncio.ensure_future(self.eventlog.close())
+        self.spool.close()
+
+    async def cog_after_invoke(self, ctx):
+        if ctx.command.qualified_name.startswith("setstatus"):
+            self.cached_settings = None #Settings may have changed, reload them the next time they're needed
+
+    async def settings(self) -> dict:
+        """
+        Returns a snapshot of the cog's settings, only reading from the config when setstatus has changed something
+        """
+        if self.cached_settings is None:
+            settings = await self.config.all()
+            self.key_routes = {profile['comms_key']: name for name, profile in settings['servers'].items() if profile.get('comms_key')}
+            self.key_routes[settings['comms_key']] = None
+            self.cached_settings = settings
+        return self.cached_settings
+
+    async def round_subscriptions(self) -> dict:
+        """
+        Returns a snapshot of the guilds subscribed to new round announcements, only reading from the config when roundsubscribe has changed something
+        """
+        if self.cached_subscriptions is None:
+            self.cached_subscriptions = {
+                guild_id: subscription for guild_id, subscription in (await self.config.all_guilds()).items() if subscription['round_channel'] is not None
+            }
+        return self.cached_subscriptions
 
     async def changed_port(self, ctx, port: int):
-        self.serv.cancel()
-        await asyncio.sleep(5) 
-        self.serv = self.bot.loop.create_task(self.listener())
+        try:
+            await self.listener()
+        except OSError as e:
+            return await ctx.send(f"I wasn't able to listen with the new settings (`{e}`), so I'm still listening with the old ones. The new settings will be tried again the next time the cog is loaded.")
         await ctx.send(f"Listening on port: {port}")
 
     @commands.guild_only()
@@ -222,6 +329,43 @@ class SS13Status(commands.Cog):
         except (ValueError, KeyError, AttributeError):
             await ctx.send("There was a problem setting your port. Please check to ensure you're attempting to use a port from 1024 to 65535")
 
+    @setstatus.command()
+    async def listenhost(self, ctx, host: str):
+        """
+        Set the address you'd like the bot to listen on
+
+        Use `127.0.0.1` if the game server is on the same machine so the port isn't reachable from outside, `0.0.0.0` to listen on every interface (default), or `off` to only listen on the unix socket set with `setstatus listensocket`.
+        """
+        if host.lower() == 'off':
+            if await self.config.listen_socket() is None:
+                return await ctx.send(f"Please set a unix socket with `{ctx.prefix}setstatus listensocket` before turning off the TCP listener.")
+            host = None
+        try:
+            await self.config.listen_host.set(host)
+            await ctx.send(f"Changing the listening address...")
+            await self.changed_port(ctx, await self.config.listen_port())
+        except (ValueError, KeyError, AttributeError):
+            await ctx.send(f"There was a problem setting the listening address. Please check your entry and try again.")
+
+    @setstatus.command()
+    async def listensocket(self, ctx, path: str = None):
+        """
+        Set a unix socket you'd like the bot to listen on, in addition to the TCP port
+
+        This is the cheapest way to deliver game events when the bot and game (or a proxy in front of the bot) run on the same machine. Not available on Windows.
+        Use without providing a path to stop listening on a socket. If the TCP listener is off, set an address with `setstatus listenhost` first.
+        """
+        if path is not None and not hasattr(asyncio, 'start_unix_server'):
+            return await ctx.send("Unix sockets aren't supported on this system.")
+        if path is None and await self.config.listen_host() is None: #Don't leave the listener with nothing to listen on
+            return await ctx.send(f"Please set an address with `{ctx.prefix}setstatus listenhost` before removing the unix socket, the TCP listener is turned off.")
+        try:
+            await self.config.listen_socket.set(path)
+            await ctx.send(f"Changing the listening socket...")
+            await self.changed_port(ctx, await self.config.listen_port())
+        except (ValueError, KeyError, AttributeError):
+            await ctx.send("There was a problem setting the listening socket. Please check your entry and try again.")
+
     @setstatus.command()
     async def timeout(self, ctx, seconds: int):
         """
@@ -233,12 +377,111 @@ class SS13Status(commands.Cog):
         except(ValueError, KeyError, AttributeError):
             await ctx.send("There was a problem setting the timeout duration. Please check your input and try again.")
 
+    @setstatus.command()
+    async def cachettl(self, ctx, seconds: int):
+        """
+        Sets how long server responses are reused before querying the server again
+
+        Requests made at the same time will always share a single query. Set this to 0 to disable caching otherwise.
+        """
+        try:
+            if seconds >= 0:
+                await self.config.cache_ttl.set(seconds)
+                self.snapshots.invalidate()
+                await ctx.send(f"Server responses will be cached for: `{seconds} seconds`")
+            else:
+                await ctx.send(f"`{seconds}` is not a valid duration!")
+        except(ValueError, KeyError, AttributeError):
+            await ctx.send("There was a problem setting the cache duration. Please check your input and try again.")
+
+    @setstatus.command()
+    async def pinglimit(self, ctx, pings: int, seconds: int):
+        """
+        Sets how often the bot may @here the admin channel when no admins are online
+
+        For example, `pinglimit 1 300` allows one ping every 5 minutes and `pinglimit 3 600` allows up to 3 pings in a row, recovering one every 200 seconds. New tickets and round ending events are limited separately.
+        """
+        if pings < 1 or seconds < 0:
+            return await ctx.send("Please provide at least 1 ping and a positive number of seconds.")
+        try:
+            await self.config.ping_burst.set(pings)
+            await self.config.ping_period.set(seconds)
+            await ctx.send(f"I will send at most `{pings}` ping(s) every `{seconds} seconds` for each type of event.")
+        except(ValueError, KeyError, AttributeError):
+            await ctx.send("There was a problem setting the ping limit. Please check your input and try again.")
+
+    @setstatus.command()
+    async def joinleavechannel(self, ctx, text_channel: discord.TextChannel = None):
+        """
+        Sets the channel for player join/leave notices
+
+        The player list is checked in the background (see `setstatus joinleaveinterval`) and any changes are posted here. Requires the `whoIs` topic, see the readme for details.
+        Use without providing a channel to reset this to None.
+        """
+        try:
+            if text_channel is not None:
+                await self.config.join_leave_channel.set(text_channel.id)
+                await ctx.send(f"Players joining and leaving will be posted in: {text_channel.mention}")
+            else:
+                await self.config.join_leave_channel.set(None)
+                await ctx.send("I will no longer post when players join or leave.")
+        except(ValueError, KeyError, AttributeError):
+            await ctx.send("There was a problem setting the notification channel. Please check your entry and try again.")
+
+    @setstatus.command()
+    async def joinleaveinterval(self, ctx, seconds: int):
+        """
+        Sets how often the player list is checked for join/leave notices
+        """
+        if seconds < 15:
+            return await ctx.send("Please use an interval of at least 15 seconds.")
+        await self.config.join_leave_interval.set(seconds)
+        await ctx.send(f"I will check for players joining and leaving every `{seconds} seconds`.")
+
+    @setstatus.command()
+    async def statusboard(self, ctx, text_channel: discord.TextChannel = None):
+        """
+        Posts a status board that keeps itself up to date
+
+        The board is a single pinned message with the server's status, edited in place every few minutes (see `setstatus boardinterval`) so nobody needs to run the status command. Defaults to the current channel.
+        Use again in a channel that already has a board to remove it.
+        """
+        channel = text_channel or ctx.channel
+        boards = await self.config.status_boards()
+        if str(channel.id) in boards:
+            message_id = boards.pop(str(channel.id))
+            await self.config.status_boards.set(boards)
+            try:
+                await channel.get_partial_message(message_id).delete()
+            except discord.DiscordException:
+                pass #Already deleted
+            return await ctx.send(f"I will no longer keep a status board in {channel.mention}.")
+
+        try:
+            embed = await self.status_embed(await self.get_profile(), await self.board_status())
+            await self.post_board(channel, embed)
+            await ctx.send(f"Status board posted in {channel.mention}. It will update every `{await self.config.board_interval()} seconds`.")
+        except discord.Forbidden:
+            await ctx.send(f"I'm not able to post in {channel.mention}. Please check my permissions and try again.")
+        except(ValueError, KeyError, AttributeError):
+            await ctx.send("There was a problem setting up the status board. Please check your entry and try again.")
+
+    @setstatus.command()
+    async def boardinterval(self, ctx, seconds: int):
+        """
+        Sets how often status boards are updated
+        """
+        if seconds < 30:
+            return await ctx.send("Please use an interval of at least 30 seconds.")
+        await self.config.board_interval.set(seconds)
+        await ctx.send(f"Status boards will be updated every `{seconds} seconds`.")
+
     @setstatus.command()
     async def toggletopic(self, ctx, toggle:bool = None):
         """
         Channel topic status toggle
 
-        With this enabled, the topic description will be automatically set with the server's latest details. Automatically updating every 5 minutes.
+        With this enabled, the topic description will be automatically set with the server's latest details. Automatically updating whenever the details change, at most once every 5 minutes.
         """
 
         if toggle is None:
@@ -261,6 +504,105 @@ class SS13Status(commands.Cog):
         except:
             await ctx.send("I was unable to clear the channel's current topic. You might want to clear it manually.")
 
+    @setstatus.command()
+    async def addserver(self, ctx, name: str, host: str, port: int, url: str = None):
+        """
+        Adds an additional game server that can be checked by name
+
+        The server uses the same comms key and topic system as the main server, unless it's given its own key with `setstatus serverkey`. For example, `status <name>` will check the added server and `status all` will check every server at once.
+        """
+        name = name.lower()
+        if name in ('all', 'default'):
+            return await ctx.send(f"`{name}` is reserved, please choose another name.")
+        if not 1024 <= port <= 65535:
+            return await ctx.send(f"`{port}` is not a valid port!")
+
+        try:
+            async with self.config.servers() as servers:
+                servers[name] = {"host": host, "port": port, "server_url": url or f"byond://{host}:{port}"}
+            await ctx.send(f"Added `{name}` ({host}:{port}).")
+        except (ValueError, KeyError, AttributeError):
+            await ctx.send("There was a problem adding the server. Please check your entry and try again.")
+
+    @setstatus.command()
+    async def removeserver(self, ctx, name: str):
+        """
+        Removes a server added with `setstatus addserver`
+        """
+        name = name.lower()
+        async with self.config.servers() as servers:
+            if name not in servers:
+                return await ctx.send(f"I don't have a server named `{name}`.")
+            del servers[name]
+        await ctx.send(f"Removed `{name}`.")
+
+    @setstatus.command()
+    async def serverkey(self, ctx, name: str, key: str = None):
+        """
+        Sets a separate comms key for a server added with `setstatus addserver`
+
+        Game data sent with this key is posted to that server's channels (see `setstatus serverchannel`), and the key is used for that server's topic queries. Use without providing a key to go back to using the main comms key.
+        """
+        name = name.lower()
+        settings = await self.config.all()
+        if name not in settings['servers']:
+            return await ctx.send(f"I don't have a server named `{name}`.")
+        if key is not None and (key == settings['comms_key'] or any(profile.get('comms_key') == key for other, profile in settings['servers'].items() if other != name)):
+            return await ctx.send("That key is already used by another server, please choose another.")
+
+        try:
+            async with self.config.servers() as servers:
+                servers[name]['comms_key'] = key
+            await ctx.send(f"Comms key for `{name}` {'set' if key is not None else 'reset to the main comms key'}.")
+            if key is not None:
+                try:
+                    await ctx.message.delete()
+                except(discord.DiscordException):
+                    await ctx.send("I do not have the required permissions to delete messages. You may wish to edit/remove your comms key manually.")
+        except(ValueError, KeyError, AttributeError):
+            await ctx.send("There was a problem setting the comms key. Please check your entry and try again.")
+
+    @setstatus.command()
+    async def serverchannel(self, ctx, name: str, notice: str, text_channel: discord.TextChannel = None):
+        """
+        Sets where a server added with `setstatus addserver` posts its game data
+
+        The notice type is one of `newround`, `admin`, or `mentor`. Notices without a channel set here are posted in the main server's channels. Requires the server to have its own comms key (`setstatus serverkey`).
+        Use without providing a channel to go back to the main server's channel.
+        """
+        name = name.lower()
+        setting = {"newround": "new_round_channel", "admin": "admin_notice_channel", "mentor": "mentor_notice_channel"}.get(notice.lower())
+        if setting is None:
+            return await ctx.send("Please choose `newround`, `admin`, or `mentor`.")
+
+        try:
+            async with self.config.servers() as servers:
+                if name not in servers:
+                    return await ctx.send(f"I don't have a server named `{name}`.")
+                servers[name][setting] = text_channel.id if text_channel is not None else None
+            if text_channel is not None:
+                await ctx.send(f"`{name}` {notice.lower()} notices will be posted in {text_channel.mention}.")
+            else:
+                await ctx.send(f"`{name}` {notice.lower()} notices will be posted in the main server's channel.")
+        except(ValueError, KeyError, AttributeError):
+            await ctx.send("There was a problem setting the channel. Please check your entry and try again.")
+
+    @setstatus.command()
+    async def togglemetrics(self, ctx, toggle: bool = None):
+        """
+        Serve Prometheus metrics from the listener at `/metrics`
+
+        The metrics are available to anything that can reach the listen port, so you may want to firewall it accordingly.
+        """
+        if toggle is None:
+            toggle = not await self.config.metrics()
+
+        await self.config.metrics.set(toggle)
+        if toggle is True:
+            await ctx.send(f"Metrics are now available at `http://<bot ip>:{await self.config.listen_port()}/metrics`.")
+        else:
+            await ctx.send("I will no longer serve metrics.")
+
     @setstatus.command()
     async def current(self, ctx):
         """
@@ -280,8 +622,12 @@ class SS13Status(commands.Cog):
                     embed.add_field(name=f"{k}:", value=role.name)
                 else:
                     embed.add_field(name=f"{k}:", value=v)
-            elif k == 'timeout':
+            elif k == 'timeout' or k == 'cache_ttl':
                 embed.add_field(name=f"{k}:", value=f"{v} seconds")
+            elif k == 'status_boards':
+                embed.add_field(name=f"{k}:", value=' '.join(f"<#{channel_id}>" for channel_id in v) or None, inline=False)
+            elif k == 'servers':
+                embed.add_field(name=f"{k}:", value='\n'.join(f"{name} ({info['host']}:{info['port']})" for name, info in v.items()) or None, inline=False)
             else:
                 embed.add_field(name=f"{k}:", value=v, inline=False)
         
@@ -304,16 +650,17 @@ class SS13Status(commands.Cog):
 
     @commands.guild_only()
     @commands.command()
-    async def players(self, ctx):
+    async def players(self, ctx, server: str = None):
         """
         Lists the current players on the server
+
+        Provide the name of a server added with `setstatus addserver` to check that server instead.
         """
-        port = await self.config.game_port()
+        profile = await self.get_profile(server)
+        if profile is None:
+            return await ctx.send(f"I don't know of a server named `{server}`.")
         try:
-            server = socket.gethostbyname(await self.config.server())
-            topic_system = await self.config.legacy_topics()
-            comms_key = await self.config.comms_key()
-            data = await self.query_server(server, port, "?whoIs", topic_system, comms_key)
+            data = await self.query_profile(profile, "?whoIs")
         except TypeError:
             await ctx.send(f"Failed to get players. Check that you have fully configured this cog using `{ctx.prefix}setstatus`.")
             return
@@ -322,26 +669,27 @@ class SS13Status(commands.Cog):
             try:
                 players = [i for i in data['players']]
 
-                embed = discord.Embed(title=f"__Current Players__ ({len(players)}): ", description=f'\n'.join(map(str,players)))
+                embed = discord.Embed(title=f"__Current Players{self.profile_suffix(profile)}__ ({len(players)}): ", description=f'\n'.join(map(str,players)))
 
                 await ctx.send(embed=embed)
             except KeyError:
                 await ctx.send("Unable to determine who is playing! Please check the world topic to ensure it is correctly configured.")
         else:
-            await ctx.send(embed=discord.Embed(title="__Current Players__ (0):", description="No players current online"))
+            await ctx.send(embed=discord.Embed(title=f"__Current Players{self.profile_suffix(profile)}__ (0):", description="No players current online"))
 
     @commands.guild_only()
     @commands.command()
-    async def adminwho(self, ctx):
+    async def adminwho(self, ctx, server: str = None):
         """
         List the current admins on the server
+
+        Provide the name of a server added with `setstatus addserver` to check that server instead.
         """
-        port = await self.config.game_port()
+        profile = await self.get_profile(server)
+        if profile is None:
+            return await ctx.send(f"I don't know of a server named `{server}`.")
         try:
-            server = socket.gethostbyname(await self.config.server())
-            topic_system = await self.config.legacy_topics()
-            comms_key = await self.config.comms_key()
-            data = await self.query_server(server, port, "?getAdmins", topic_system, comms_key)
+            data = await self.query_profile(profile, "?getAdmins")
         except TypeError:
             await ctx.send(f"Failed to get admins. Check that you have fully configured this cog using `{ctx.prefix}setstatus`.")
             return
@@ -350,80 +698,296 @@ class SS13Status(commands.Cog):
             try:
                 admins = [i for i in data['admins']]
 
-                embed = discord.Embed(title=f"__Current Admins__ ({len(admins)}): ", description=f'\n'.join(map(str,admins)))
+                embed = discord.Embed(title=f"__Current Admins{self.profile_suffix(profile)}__ ({len(admins)}): ", description=f'\n'.join(map(str,admins)))
 
                 await ctx.send(embed=embed)
             except KeyError:
                 await ctx.send("Unable to determine who is administrating! Please check the world topic to ensure it is correctly configured.")
         else:
-            await ctx.send(embed=discord.Embed(title="__Current Admins__ (0):", description="No Admins are current online"))
+            await ctx.send(embed=discord.Embed(title=f"__Current Admins{self.profile_suffix(profile)}__ (0):", description="No Admins are current online"))
         
 
 
     @commands.guild_only()
     @commands.command()
     @commands.cooldown(1, 5)
-    async def status(self, ctx):
+    async def status(self, ctx, server: str = None):
         """
         Gets the current server status and round details
+
+        Provide the name of a server added with `setstatus addserver` to check that server instead, or `all` to check every server at once.
         """
-        port = await self.config.game_port()        
-        msg = await self.config.offline_message()
-        server_url = await self.config.server_url()
+        if server is not None and server.lower() == 'all':
+            return await self.status_all(ctx)
+
+        profile = await self.get_profile(server)
+        if profile is None:
+            return await ctx.send(f"I don't know of a server named `{server}`.")
         try:
-            server = socket.gethostbyname(await self.config.server())
-            topic_system = await self.config.legacy_topics()
-            data = await self.query_server(server, port, legacy=topic_system)
+            data = await self.query_profile(profile)
         except TypeError:
             return await ctx.send(f"Failed to get the server's status. Check that you have fully configured this cog using `{ctx.prefix}setstatus`.")
         except LookupError as e:
             return await ctx.send(f"There appears to be an error with this cog's configuration. Please contact an admin with the following:\n`{e}`")
 
+        embed = await self.status_embed(profile, data)
         if not data: #Server is not responding, send the offline message
-            embed=discord.Embed(title="__Server Status:__", description=f"{msg}", color=0xff0000)
             await ctx.send(embed=embed)
 
         else:
-            #Reported time is in seconds, we need to convert that to be easily understood
-            duration = int(data['round_duration'])
-            duration = time.strftime('%H:%M', time.gmtime(duration))
-            #Players also includes the number of admins, so we need to do some quick math
-            players = (int(data['players']) - int(data['admins'])) 
-            #Format long map names
-            mapname = str.title(data['map_name'])
-            mapname = '\n'.join(textwrap.wrap(mapname,25))
-
-
-            #Might make the embed configurable at a later date
-
-            embed=discord.Embed(color=0x26eaea)
-            embed.add_field(name="Map", value=mapname, inline=True)
-            embed.add_field(name="Security Level", value=str.title(data['security_level']), inline=True)
-            if  "shuttle_mode" in data:
-                if ("docked" or "call") not in data['shuttle_mode']:
-                    embed.add_field(name="Shuttle Status", value=str.title(data['shuttle_mode']), inline=True)
-                else:
-                    embed.add_field(name="Shuttle Timer", value=time.strftime('%M:%S', time.gmtime(int(data['shuttle_timer']))), inline=True)
-            else:
-                embed.add_field(name="Shuttle Status", value="Refueling", inline=True)
-            embed.add_field(name="Players", value=players, inline=True)
-            embed.add_field(name="Admins", value=int(data['admins']), inline=True)
-            embed.add_field(name="Round Duration", value=duration, inline=True)
-            embed.add_field(name="Server Link:", value=f"<{server_url}>", inline=False)
-
             try:
                 await self.statusmsg.delete()
                 self.statusmsg = await ctx.send(embed=embed)
             except(discord.DiscordException, AttributeError):
                 self.statusmsg = await ctx.send(embed=embed)
+
+    async def status_embed(self, profile: dict, data: StatusSnapshot) -> discord.Embed:
+        """
+        Builds the status embed shown by the status command and status boards
+        """
+        if not data:
+            return discord.Embed(title=f"__Server Status{self.profile_suffix(profile)}:__", description=f"{await self.config.offline_message()}", color=0xff0000)
+
+        #Reported time is in seconds, we need to convert that to be easily understood
+        duration = time.strftime('%H:%M', time.gmtime(data.round_duration))
+        #Format long map names
+        mapname = str.title(data.map_name)
+        mapname = '\n'.join(textwrap.wrap(mapname,25))
+
+
+        #Might make the embed configurable at a later date
+
+        embed=discord.Embed(color=0x26eaea)
+        if profile['name'] is not None:
+            embed.title = f"__{profile['name'].title()}__"
+        embed.add_field(name="Map", value=mapname, inline=True)
+        embed.add_field(name="Security Level", value=str.title(data.security_level), inline=True)
+        if data.shuttle_mode is not None:
+            if "docked" not in data.shuttle_mode:
+                embed.add_field(name="Shuttle Status", value=str.title(data.shuttle_mode), inline=True)
+            else:
+                embed.add_field(name="Shuttle Timer", value=time.strftime('%M:%S', time.gmtime(data.shuttle_timer)), inline=True)
+        else:
+            embed.add_field(name="Shuttle Status", value="Refueling", inline=True)
+        embed.add_field(name="Players", value=data.crew, inline=True) #The server counts admins as players
+        embed.add_field(name="Admins", value=data.admins, inline=True)
+        embed.add_field(name="Round Duration", value=duration, inline=True)
+        embed.add_field(name="Server Link:", value=f"<{profile['server_url']}>", inline=False)
+        return embed
+
+    async def status_all(self, ctx):
+        """
+        Checks every configured server at once and reports them in a single embed
+        """
+        profiles = await self.all_profiles()
+        if not profiles:
+            return await ctx.send(f"Failed to get the server's status. Check that you have fully configured this cog using `{ctx.prefix}setstatus`.")
+
+        offline_msg = await self.config.offline_message()
+        results = await self.query_profiles(profiles)
+
+        embed = discord.Embed(title="__Server Status:__", color=0x26eaea)
+        for profile, data in zip(profiles, results):
+            name = (profile['name'] or "Main").title()
+            if isinstance(data, LookupError):
+                embed.add_field(name=name, value=f"Configuration error: `{data}`", inline=False)
+            elif isinstance(data, Exception) or not data:
+                embed.add_field(name=name, value=f"{offline_msg}\n<{profile['server_url']}>", inline=False)
+            else:
+                duration = time.strftime('%H:%M', time.gmtime(data.round_duration))
+                embed.add_field(name=name, value=f"**Map:** {str.title(data.map_name)} | **Players:** {data.crew} | **Admins:** {data.admins} | **Round Duration:** {duration}\n<{profile['server_url']}>", inline=False)
+
+        await ctx.send(embed=embed)
+
+    async def get_profile(self, name: str = None) -> dict:
+        """
+        Gets the connection details for a server by name, or for the main server if no name is given
+        """
+        if name is None or name.lower() == 'default':
+            return {
+                "name": None,
+                "host": await self.config.server(),
+                "port": await self.config.game_port(),
+                "server_url": await self.config.server_url()
+            }
+
+        profile = (await self.config.servers()).get(name.lower())
+        if profile is not None:
+            profile = dict(profile, name=name.lower())
+        return profile
+
+    async def all_profiles(self) -> list:
+        """
+        Lists every fully configured server, starting with the main server
+        """
+        profiles = [await self.get_profile()]
+        profiles += [dict(profile, name=name) for name, profile in (await self.config.servers()).items()]
+        return [profile for profile in profiles if profile['host'] is not None and profile['port'] is not None]
+
+    @staticmethod
+    def profile_suffix(profile: dict) -> str:
+        return f" - {profile['name'].title()}" if profile['name'] is not None else ""
+
+    async def query_profile(self, profile: dict, querystr: str = "?status") -> dict:
+        """
+        Queries a configured server using the cog's comms key and topic system
+        """
+        start = time.perf_counter()
+        server = await self.resolver.resolve(profile['host'])
+        self.topic_phases.observe(time.perf_counter() - start, "resolve")
+        topic_system = await self.config.legacy_topics()
+        comms_key = profile.get('comms_key') or await self.config.comms_key()
+        if querystr == "?status":
+            return await self.query_server(server, profile['port'], legacy=topic_system)
+        return await self.query_server(server, profile['port'], querystr, topic_system, comms_key)
+
+    async def query_profiles(self, profiles: list, querystr: str = "?status") -> list:
+        """
+        Queries several servers concurrently, returning each server's result or the exception it raised
+
+        Every server is given the configured timeout, so checking them all takes about as long as the slowest one.
+        """
+        timeout = await self.config.timeout()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+        async def query(profile):
+            async with semaphore:
+                return await asyncio.wait_for(self.query_profile(profile, querystr), timeout + 1)
+
+        return await asyncio.gather(*(query(profile) for profile in profiles), return_exceptions=True)
         
 
-    async def query_server(self, game_server:str, game_port:int, querystr: str = "?status", legacy: bool = None, key: str = "anonymous") -> dict:
+    @commands.guild_only()
+    @commands.command()
+    @commands.cooldown(1, 5)
+    async def statushistory(self, ctx, hours: int = 24):
         """
-        Queries the server for information
+        Shows the server's population over the past few hours (up to a week)
+
+        History is gathered by the background server checks every 5 minutes and resets whenever the cog is reloaded.
+        """
+        if not 1 <= hours <= 168:
+            return await ctx.send("Please choose a number of hours between 1 and 168.")
+
+        samples = self.history.since(time.time() - (hours * 3600))
+        if not samples:
+            return await ctx.send(f"I haven't collected any history yet. Make sure the server is configured using `{ctx.prefix}setstatus` and check back in a few minutes.")
+
+        online = [s for s in samples if s[1]]
+        players = [s[2] if s[1] else None for s in samples]
+
+        embed = discord.Embed(title=f"__Server History__ (last {hours} hours)", description=f"```\n{sparkline(players)}\n```", color=0x26eaea)
+        if online:
+            embed.add_field(name="Peak Players", value=max(s[2] for s in online), inline=True)
+            embed.add_field(name="Average Players", value=round(sum(s[2] for s in online) / len(online)), inline=True)
+            embed.add_field(name="Peak Admins", value=max(s[3] for s in online), inline=True)
+            embed.add_field(name="Longest Round", value=time.strftime('%H:%M', time.gmtime(max(s[4] for s in online))), inline=True)
+        embed.add_field(name="Uptime", value=f"{round(len(online) / len(samples) * 100)}%", inline=True)
+        embed.set_footer(text=f"{len(samples)} samples since {datetime.utcfromtimestamp(samples[0][0]).strftime('%Y-%m-%d %H:%M')} UTC")
+
+        await ctx.send(embed=embed)
+
+    @commands.guild_only()
+    @commands.command()
+    @checks.admin_or_permissions(manage_guild=True)
+    async def roundsubscribe(self, ctx, text_channel: discord.TextChannel = None, role: discord.Role = None):
         """
-        conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM) 
+        Subscribes a channel in this Discord to new round announcements
 
+        Optionally provide a role to mention with each announcement. The role is mentioned even if it isn't set as mentionable, provided I have permission to mention all roles in that channel.
+        Use without providing a channel to unsubscribe.
+        """
+        try:
+            await self.config.guild(ctx.guild).round_channel.set(text_channel.id if text_channel is not None else None)
+            await self.config.guild(ctx.guild).round_role.set(role.id if role is not None and text_channel is not None else None)
+            self.cached_subscriptions = None
+            if text_channel is None:
+                await ctx.send("This Discord will no longer receive new round announcements.")
+            elif role is None:
+                await ctx.send(f"New round announcements will be posted in {text_channel.mention}.")
+            else:
+                await ctx.send(f"New round announcements will be posted in {text_channel.mention}, mentioning `{role.name}`.")
+        except(ValueError, KeyError, AttributeError):
+            await ctx.send("There was a problem setting up the subscription. Please check your entry and try again.")
+
+    @commands.guild_only()
+    @commands.command()
+    @commands.cooldown(1, 5)
+    async def roundstats(self, ctx, days: int = 7, server: str = None):
+        """
+        Shows round and ticket statistics for the past few days (up to 90)
+
+        Statistics are built from the new round and ticket notifications sent by the game server. Provide the name of a server added with `setstatus addserver` to see that server's statistics instead.
+        """
+        if not 1 <= days <= 90:
+            return await ctx.send("Please choose a number of days between 1 and 90.")
+        profile = await self.get_profile(server)
+        if profile is None:
+            return await ctx.send(f"I don't know of a server named `{server}`.")
+
+        stats = await self.eventlog.round_stats(days, profile['name'])
+        if not stats['rounds']:
+            return await ctx.send(f"I haven't seen any rounds start in the last {days} day(s).")
+
+        admin_tickets = stats['tickets'].get('admin_ticket', 0)
+        mentor_tickets = stats['tickets'].get('mentor_ticket', 0)
+
+        embed = discord.Embed(title=f"__Round Statistics{self.profile_suffix(profile)}__ (last {days} days)", color=0x26eaea)
+        embed.add_field(name="Rounds", value=stats['rounds'], inline=True)
+        embed.add_field(name="Rounds per Day", value=f"{stats['rounds'] / days:.1f}", inline=True)
+        if stats['average_duration'] is not None:
+            embed.add_field(name="Average Duration", value=time.strftime('%H:%M', time.gmtime(stats['average_duration'])), inline=True)
+        embed.add_field(name="Admin Tickets per Round", value=f"{admin_tickets / stats['rounds']:.1f}", inline=True)
+        embed.add_field(name="Mentor Tickets per Round", value=f"{mentor_tickets / stats['rounds']:.1f}", inline=True)
+        if stats['busiest_round'] is not None:
+            embed.add_field(name="Busiest Round", value=f"{stats['busiest_round'][0]} ({stats['busiest_round'][1]} tickets)", inline=True)
+        embed.add_field(name="Rounds by Day", value=box("\n".join(f"{day}: {count}" for day, count in stats['per_day'][-14:])), inline=False)
+
+        await ctx.send(embed=embed)
+
+    @commands.guild_only()
+    @commands.command()
+    @checks.admin_or_permissions(administrator=True)
+    async def statusstats(self, ctx):
+        """
+        Shows how long topic queries to the game server are taking
+
+        Times are split by phase (DNS lookup, connecting, sending, waiting for the first byte, receiving, and decoding) to help tune `setstatus timeout`. Statistics reset whenever the cog is reloaded.
+        """
+        def fmt(seconds):
+            return "-" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+        lines = [f"{'Phase':<12}{'Count':>7}{'p50':>9}{'p95':>9}{'p99':>9}"]
+        for phase in ("resolve", "connect", "send", "first_byte", "receive", "decode"):
+            lines.append(f"{phase:<12}{self.topic_phases.count(phase):>7}" + "".join(f"{fmt(self.topic_phases.quantile(q, phase)):>9}" for q in (0.5, 0.95, 0.99)))
+
+        lines.append("")
+        lines.append(f"{'Query':<12}{'Count':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'Fails':>7}{'T/O':>5}")
+        for (query,) in sorted(set(self.topic_latency.series) | set(self.topic_failures.values)):
+            lines.append(
+                f"{query[:12]:<12}{self.topic_latency.count(query):>7}"
+                + "".join(f"{fmt(self.topic_latency.quantile(q, query)):>9}" for q in (0.5, 0.95, 0.99))
+                + f"{self.topic_failures.values.get((query,), 0):>7}{self.topic_timeouts.values.get((query,), 0):>5}"
+            )
+
+        embed = discord.Embed(title="__Topic Query Statistics__", description=box("\n".join(lines)), color=0x26eaea)
+        embed.set_footer(text=f"Current timeout: {await self.config.timeout()} seconds")
+        await ctx.send(embed=embed)
+
+    async def query_server(self, game_server:str, game_port:int, querystr: str = "?status", legacy: bool = None, key: str = "anonymous") -> dict:
+        """
+        Queries the server for information, reusing any recent or in-flight response for the same query
+
+        ?status replies are returned as a StatusSnapshot, anything else as a dict.
+        """
+        self.snapshots.ttl = await self.config.cache_ttl()
+        return await self.snapshots.get(
+            (game_server, game_port, querystr, legacy, key),
+            lambda: self._query_server(game_server, game_port, querystr, legacy, key)
+        )
+
+    async def _query_server(self, game_server:str, game_port:int, querystr: str, legacy: bool, key: str) -> dict:
+        query_name = querystr.lstrip("?")
         try:
             if legacy is False:
                 querystr = json.dumps({
@@ -432,23 +996,28 @@ class SS13Status(commands.Cog):
                     "source": "Redbot - ss13Status"
                 })
 
-            query = b"\x00\x83" + struct.pack('>H', len(querystr) + 6) + b"\x00\x00\x00\x00\x00" + querystr.encode() + b"\x00" #Creates a packet for byond according to TG's standard   
-            conn.settimeout(await self.config.timeout()) #Byond is slow, timeout set relatively high to account for any latency
-            conn.connect((game_server, game_port)) 
-
-            conn.sendall(query)
-
-            data = conn.recv(4096) #Minimum number should be 4096, anything less will lose data
+            #Byond is slow, timeout set relatively high to account for any latency
+            timings = {}
+            start = time.perf_counter()
+            data = await topic_query(game_server, game_port, querystr, await self.config.timeout(), timings)
+            self.topic_latency.observe(time.perf_counter() - start, query_name)
+            for phase, duration in timings.items():
+                self.topic_phases.observe(duration, phase)
 
+            start = time.perf_counter()
             if legacy or legacy is None:
-                parsed_data = urllib.parse.parse_qs(data[5:-1].decode())
+                parsed_data = urllib.parse.parse_qs(data.decode())
                 for k,v in parsed_data.items(): #Legacy topics return a dict of lists
-                    parsed_data[k] = v[0]
+                    if k != LIST_FIELDS.get(query_name): #Except for player/admin lists, only the first value matters
+                        parsed_data[k] = v[0]
             else:
-                parsed_data = json.loads(data[5:-1].decode())
+                parsed_data = json.loads(data.decode())
                 if 'data' not in parsed_data:
                     raise LookupError(f"Bad response from server {parsed_data}")
                 parsed_data = parsed_data['data']
+            if query_name == "status":
+                parsed_data = StatusSnapshot(parsed_data) if parsed_data else None #An empty reply means the world isn't ready
+            self.topic_phases.observe(time.perf_counter() - start, "decode")
 
             return parsed_data
             """
@@ -476,8 +1045,11 @@ class SS13Status(commands.Cog):
             +----------------+--------+
             """ #pylint: disable=unreachable
             
-        except (ConnectionRefusedError, socket.gaierror, socket.timeout, TimeoutError) as e:
-            log.debug(f"Unable to retrieve information from the server due to:\n{e}")
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            self.topic_failures.inc(query_name)
+            if isinstance(e, asyncio.TimeoutError):
+                self.topic_timeouts.inc(query_name)
+            log.debug(f"Unable to retrieve information from the server due to:\n{e!r}")
             return None #Server is likely offline
         except LookupError as e:
             log.warning(e)
@@ -485,181 +1057,479 @@ class SS13Status(commands.Cog):
         except json.JSONDecodeError:
             log.warning(f"Unable to communicate with the server. It looks like we're sending updated topic requests but the server is expecting legacy requests.")
             raise LookupError("A JSON request sent, but one was not returned. Verify that the correct topic system is set.")
-
-        finally:
-            conn.close()
+        except ValueError as e:
+            log.warning(f"Unable to decode the server's response:\n{e}")
+            return None
 
     async def data_handler(self, reader, writer):
-        ###############
-        #Data Handling#
-        ###############
-        data = await reader.read(10000)
-        msg = data.decode()
-        msg = msg.split(" ")[1] #Drop the 'GET'
-        parsed_data = urllib.parse.parse_qs(msg[2:len(msg)]) #Drop the leading ?/ and make the text readable
-
-        writer.close()
-        
-        ##################
-        #Message Handling#
-        ##################
-        admin_channel = self.bot.get_channel(await self.config.admin_notice_channel())
-        mentor_channel = self.bot.get_channel(await self.config.mentor_notice_channel())
-        new_round_channel = self.bot.get_channel(await self.config.new_round_channel())
-        if admin_channel is not None:
-            mention_role = discord.utils.get(admin_channel.guild.roles, id=(await self.config.mention_role()))
-        comms_key = await self.config.comms_key()
-        byondurl = await self.config.server_url()
-        parser = htmlparser.HTMLParser()
-
-        log.debug("Message incoming!")
+        """
+        Serves requests from the game server until it closes the connection
+        """
+        try:
+            while True:
+                ###############
+                #Data Handling#
+                ###############
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    log.debug(f"Unable to parse an incoming request: {e}")
+                    self.respond(writer, e.status, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None: #The game server is done sending data
+                    break
+
+                keep_alive = request.keep_alive
+                settings = await self.settings()
+                if request.method not in ('GET', 'POST'):
+                    self.respond(writer, 405, keep_alive=keep_alive)
+                    await writer.drain()
+                    continue
+
+                if request.path == '/metrics':
+                    if settings['metrics'] and request.method == 'GET':
+                        self.respond(writer, 200, self.metrics.render(), keep_alive, "text/plain; version=0.0.4; charset=utf-8")
+                    else:
+                        self.respond(writer, 404, keep_alive=keep_alive)
+                    await writer.drain()
+                    continue
+
+                parsed_data = request.params()
+                server = next((self.key_routes[key] for key in parsed_data.get('key', ()) if key in self.key_routes), UNKNOWN_KEY)
+                if server is UNKNOWN_KEY: #Check to ensure that we're only serving messages from our games
+                    log.debug(f"""Message recieved but {"the key did not match." if 'key' in parsed_data else "no key was provided."}""")
+                    self.auth_failures.inc()
+                    self.respond(writer, 403, keep_alive=keep_alive)
+                    await writer.drain()
+                    continue
+
+                if self.spool.closed: #The cog was unloaded, but this connection was accepted before it was
+                    self.respond(writer, 503, keep_alive=False)
+                    await writer.drain()
+                    break
+
+                #Spooled and handled separately so a slow (or unavailable) Discord doesn't hold up the next request on this connection
+                received = time.time()
+                try:
+                    self.spool.append({"server": server, "data": parsed_data, "received": received})
+                except OSError as e:
+                    log.warning(f"Unable to spool an incoming message, it won't survive a restart: {e}")
+                    self.dispatch(parsed_data, server, received=received)
+
+                self.respond(writer, 200, keep_alive=keep_alive)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass #The game server went away, there's nobody left to respond to
+        finally:
+            writer.close()
 
-        if ('key' in parsed_data) and (comms_key in parsed_data['key']): #Check to ensure that we're only serving messages from our game
-            if ('serverStart' in parsed_data) and (new_round_channel is not None):
-                embed = discord.Embed(title="Starting new round!", description=f"<{byondurl}>", color=0x8080ff)
+    def respond(self, writer, status: int, body: str = None, keep_alive: bool = True, content_type: str = "text/plain; charset=utf-8"):
+        self.http_requests.inc(status)
+        write_response(writer, status, body, keep_alive, content_type)
 
-                if ('roundID' in parsed_data):
-                    self.roundID = parsed_data['roundID'][0]
-                    embed.set_footer(text=f"Round: {self.roundID}")
+    async def spool_worker(self):
+        """
+        Hands spooled game data to handle_message in the order it arrived, marking each message delivered once it's been handled
+        """
+        while True:
+            seq, record = await self.spool.get()
+            await self.handler_slots.acquire() #Don't take on more than the notification queue can hold
+            self.dispatch(record['data'], record['server'], seq, record.get('received'))
+
+    def dispatch(self, parsed_data: dict, server: str = None, seq: int = None, received: float = None):
+        task = asyncio.ensure_future(self.handle_message(parsed_data, server, received, seq))
+        self.handlers.add(task)
+        task.add_done_callback(self.handler_done)
+        if seq is not None:
+            task.add_done_callback(lambda task: self.spooled_done(task, seq))
+
+    def spooled_done(self, task, seq: int):
+        self.handler_slots.release()
+        if not task.cancelled(): #Cancelled messages (e.g. the cog unloading mid-send) are replayed on the next load
+            self.spool.ack(seq)
+
+    def handler_done(self, task):
+        self.handlers.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.error("There was an error handling an incoming message", exc_info=task.exception())
+
+    async def handle_message(self, parsed_data: dict, server: str = None, received: float = None, seq: int = None):
+        """
+        Sends an authenticated message from the game server to the relevant channel
 
-                try:
-                    await self.newroundmsg.delete()
-                    if mention_role is not None:
-                        try:
-                            await mention_role.edit(mentionable=True)
-                            self.newroundmsg = await new_round_channel.send(mention_role.mention)
-                            await mention_role.edit(mentionable=False)
-                            await self.newroundmsg.edit(embed=embed)
+        Messages from servers added with `setstatus addserver` go to that server's channels, falling back to the main server's channels for any it doesn't have.
+        `received` is when the message arrived and `seq` its place in the spool, so a message replayed after a restart is logged as of when it arrived, and only once.
+        """
+        received = received or time.time()
+        settings = await self.settings()
+        profile = settings['servers'].get(server, {}) if server is not None else {}
+        admin_channel = self.bot.get_channel(profile.get('admin_notice_channel') or settings['admin_notice_channel'])
+        mentor_channel = self.bot.get_channel(profile.get('mentor_notice_channel') or settings['mentor_notice_channel'])
+        new_round_channel = self.bot.get_channel(profile.get('new_round_channel') or settings['new_round_channel'])
+        if admin_channel is not None:
+            mention_role = admin_channel.guild.get_role(settings['mention_role']) if settings['mention_role'] is not None else None
+        else:
+            mention_role = None
+        byondurl = profile.get('server_url') or settings['server_url']
+        self.ping_limiter.configure(settings['ping_burst'], settings['ping_period'])
 
-                        except(discord.Forbidden):
-                            await admin_channel.send(f"Mentions are configured, but I don't have permissions to edit {mention_role.mention}")
-                            self.newroundmsg = await new_round_channel.send(embed=embed)
+        log.debug("Message incoming!")
 
-                    else:
-                        self.newroundmsg = await new_round_channel.send(embed=embed)
+        if 'serverStart' in parsed_data:
+            self.events_received.inc("server_start")
+            embed = discord.Embed(title="Starting new round!", description=f"<{byondurl}>", color=0x8080ff)
 
-                except(discord.DiscordException, AttributeError):
-                    if mention_role is not None:
-                        try:
-                            await mention_role.edit(mentionable=True)
-                            self.newroundmsg = await new_round_channel.send(mention_role.mention)
-                            await mention_role.edit(mentionable=False)
-                            await self.newroundmsg.edit(embed=embed)
+            if ('roundID' in parsed_data):
+                self.round_ids[server] = parsed_data['roundID'][0]
+            footer = self.round_footer(server)
+            if footer is not None:
+                embed.set_footer(text=footer)
+            self.eventlog.log("round_start", self.round_ids.get(server), timestamp=received, server=server, seq=seq)
+            if time.time() - received > ROUND_ANNOUNCE_EXPIRY: #Pinging everyone for a round that's long underway does more harm than good
+                log.info(f"Not announcing a new round that started {int(time.time() - received)} seconds ago")
+                return
 
-                        except(discord.Forbidden):
-                            await admin_channel.send(f"Mentions are configured, but I don't have permissions to edit {mention_role.name}")
-                            self.newroundmsg = await new_round_channel.send(embed=embed)
+            subscribers = asyncio.ensure_future(self.announce_subscribers(embed, new_round_channel.id if new_round_channel is not None else None))
 
-                    else:
-                        self.newroundmsg = await new_round_channel.send(embed=embed)
-            
-            elif ('announce_channel' in parsed_data) and ('mentor' in parsed_data['announce_channel']) and (mentor_channel is not None):
-                announce = str(*parsed_data['announce'])
+            try:
+                if new_round_channel is not None:
+                    if server in self.newroundmsgs: #Cleaned up in the background so it doesn't hold up the new announcement
+                        self.delete_later(self.newroundmsgs.pop(server))
+                    try:
+                        self.newroundmsgs[server] = await send_with_retry(new_round_channel, **self.round_announcement(embed, mention_role))
+                    except discord.DiscordException as e:
+                        log.warning(f"Unable to announce the new round in #{new_round_channel}: {e}")
+
+                    if (mention_role is not None) and (admin_channel is not None) and not mention_role.mentionable:
+                        if not new_round_channel.permissions_for(new_round_channel.guild.me).mention_everyone: #Discord would have silently skipped the mention
+                            await send_with_retry(admin_channel, content=f"Mentions are configured, but {mention_role.name} isn't mentionable and I don't have permission to mention all roles in {new_round_channel.mention}")
+            finally: #Subscribers are announced to even if the main announcement fails
+                await subscribers
+
+        elif ('announce_channel' in parsed_data) and ('mentor' in parsed_data['announce_channel']) and (mentor_channel is not None):
+            self.events_received.inc("mentor_ticket")
+            announce = str(*parsed_data['announce'])
+            self.eventlog.log("mentor_ticket", self.round_ids.get(server), announce, timestamp=received, server=server, seq=seq)
+            ticket = announce.split('): ')
+            ticket[1] = html.unescape(ticket[1])
+            embed = discord.Embed(title=f"{ticket[0]}):", description=ticket[1], color=0x935bfc)
+            if (footer := self.round_footer(server)) is not None:
+                embed.set_footer(text=footer)
+            await self.notifications.put(mentor_channel, embed)
+
+        elif ('announce_channel' in parsed_data) and ('admin' in parsed_data['announce_channel']) and (admin_channel is not None): #Secret messages only meant for admin eyes
+            announce = str(*parsed_data['announce'])
+            if "Ticket" in announce:
+                self.events_received.inc("admin_ticket")
+                self.eventlog.log("admin_ticket", self.round_ids.get(server), announce, timestamp=received, server=server, seq=seq)
                 ticket = announce.split('): ')
-                ticket[1] = parser.unescape(ticket[1])
-                embed = discord.Embed(title=f"{ticket[0]}):", description=ticket[1], color=0x935bfc)
-                if self.roundID is not None:
-                    embed.set_footer(text=f"Round: {self.roundID}")
-                await mentor_channel.send(embed=embed)
-
-            elif ('announce_channel' in parsed_data) and ('admin' in parsed_data['announce_channel']) and (admin_channel is not None): #Secret messages only meant for admin eyes
-                announce = str(*parsed_data['announce'])
-                if "Ticket" in announce:
-                    ticket = announce.split('): ')
-                    ticket[1] = parser.unescape(ticket[1])
-                    embed = discord.Embed(title=f"{ticket[0]}):", description=ticket[1],color=0xff0000)
-                    if self.roundID is not None:
-                        embed.set_footer(text=f"Round: {self.roundID}")
-                    await admin_channel.send(embed=embed)
-
-                elif "@here" in announce and self.antispam == 0: #Ping any online admins once every 5 minutes
-                    if "A new ticket" in announce:
-                        await admin_channel.send(f"@here - A new ticket was submitted but no admins appear to be online.\n")
-                        
-                        self.antispam = 1
-                        await asyncio.sleep(300)
-                        self.antispam = 0
-
-                    elif 4 in parsed_data['gamestate']:
-                        await admin_channel.send(f"End-round activity detected.\n")
-                    
-                    else:
-                        await admin_channel.send(f"@here - A new round ending event requires/might need attention, but there are no admins online.\n")
-
-                        self.antispam = 1
-                        await asyncio.sleep(300)
-                        self.antispam = 0
+                ticket[1] = html.unescape(ticket[1])
+                embed = discord.Embed(title=f"{ticket[0]}):", description=ticket[1],color=0xff0000)
+                if (footer := self.round_footer(server)) is not None:
+                    embed.set_footer(text=footer)
+                await self.notifications.put(admin_channel, embed)
+
+            elif "@here" in announce: #Ping any online admins, limited to once every 5 minutes by default
+                self.events_received.inc("admin_ping")
+                self.eventlog.log("admin_ping", self.round_ids.get(server), announce, timestamp=received, server=server, seq=seq)
+                if "A new ticket" in announce:
+                    if self.ping_limiter.allow((admin_channel.id, 'ticket')):
+                        await send_with_retry(admin_channel, content=f"@here - A new ticket was submitted but no admins appear to be online.\n")
+
+                elif '4' in parsed_data.get('gamestate', []):
+                    if self.ping_limiter.allow((admin_channel.id, 'end_round')):
+                        await send_with_retry(admin_channel, content=f"End-round activity detected.\n")
                 
-                elif "@here" not in announce: 
-                    embed = discord.Embed(title=announce, color=0xf95100)
-                    if self.roundID is not None:
-                        embed.set_footer(text=f"Round: {self.roundID}")
-                    await admin_channel.send(embed=embed)
+                elif self.ping_limiter.allow((admin_channel.id, 'round_event')):
+                    await send_with_retry(admin_channel, content=f"@here - A new round ending event requires/might need attention, but there are no admins online.\n")
+                
+            else:
+                self.events_received.inc("admin_notice")
+                self.eventlog.log("admin_notice", self.round_ids.get(server), announce, timestamp=received, server=server, seq=seq)
+                embed = discord.Embed(title=announce, color=0xf95100)
+                if (footer := self.round_footer(server)) is not None:
+                    embed.set_footer(text=footer)
+                await self.notifications.put(admin_channel, embed)
+
+        else: #If it's not one of the above, it's not worth serving
+            self.events_received.inc("unhandled")
+            log.debug(f"The message was not something I could handle. -- {parsed_data.get('announce')}")
+
+    async def start_listener(self):
+        try:
+            await self.listener()
+        except OSError as e:
+            log.error(f"Unable to listen for incoming game data: {e}")
+
+    def round_footer(self, server: str = None) -> str:
+        round_id = self.round_ids.get(server)
+        if server is None:
+            return f"Round: {round_id}" if round_id is not None else None
+        return f"{server.title()} | Round: {round_id}" if round_id is not None else server.title()
+
+    @staticmethod
+    def round_announcement(embed: discord.Embed, role: discord.Role = None) -> dict:
+        """
+        Builds a new round announcement that mentions the role (and only the role) in the same message as the embed
+        """
+        if role is None:
+            return {"embed": embed, "allowed_mentions": discord.AllowedMentions.none()}
+        return {"content": role.mention, "embed": embed, "allowed_mentions": discord.AllowedMentions(everyone=False, users=False, roles=[role])}
 
-            else: #If it's not one of the above, it's not worth serving
-                log.debug(f"The message was not something I could handle. -- {str(*parsed_data['announce'])}")
-                pass
-        else:#Don't serve any messages that aren't from our game
-            log.debug(f"""Message recieved but {f"the key ({str(*parsed_data['announce'])}) did not match." if 'key' in parsed_data else "no key was provided."}""")
-            pass
+    def delete_later(self, message: discord.Message):
+        task = asyncio.ensure_future(message.delete())
+        task.add_done_callback(lambda task: task.cancelled() or task.exception()) #Already deleted is fine
 
+    async def announce_subscribers(self, embed: discord.Embed, main_channel_id: int = None):
+        """
+        Sends the new round announcement to every subscribed Discord at once
+        """
+        messages = []
+        for guild_id, subscription in (await self.round_subscriptions()).items():
+            channel = self.bot.get_channel(subscription['round_channel'])
+            if channel is None or channel.id == main_channel_id: #The main channel gets its own announcement
+                continue
+            role = channel.guild.get_role(subscription['round_role']) if subscription['round_role'] is not None else None
+            messages.append((channel, self.round_announcement(embed, role)))
+
+        if messages:
+            start = time.perf_counter()
+            delivered = await fan_out(messages, send_latency=self.discord_latency)
+            log.debug(f"Announced the new round to {delivered} of {len(messages)} subscribed Discords in {time.perf_counter() - start:.2f}s")
 
     async def listener(self):
-        await asyncio.sleep(10) #Delay before listening to ensure that the interface isn't bound multiple times
-        port = await self.config.listen_port()
+        """
+        Starts listening for game data with the current settings, then stops any servers listening with the old ones
 
-        server = await asyncio.start_server(self.data_handler, '0.0.0.0', port) #Listen on all interfaces from a non-standard port
+        The new servers are bound before the old ones close, so there's no gap where game events are refused. The old
+        servers stop accepting connections, but connections they've already accepted are served until the game closes
+        them. A TCP server already listening on the same host and port is kept as it is. If the new servers can't be
+        started, the old ones are left running and the OSError is raised.
+        """
+        host = await self.config.listen_host()
+        port = await self.config.listen_port()
+        socket_path = await self.config.listen_socket()
 
-        async with server: #Listen until the cog is unloaded or the bot shutsdown
-            await server.serve_forever()
+        servers = []
+        kept = None
+        try:
+            if host is not None:
+                kept = next((entry for entry in self.servers if entry[1] == (host, port)), None)
+                if kept is not None:
+                    servers.append(kept)
+                else:
+                    server = await asyncio.start_server(self.data_handler, host, port, reuse_address=True)
+                    servers.append((server, (host, port), None))
+            if socket_path is not None:
+                server = await asyncio.start_unix_server(self.data_handler, socket_path) #Replaces any old socket file
+                servers.append((server, socket_path, os.stat(socket_path).st_ino))
+        except BaseException:
+            self.close_servers([entry for entry in servers if entry is not kept])
+            raise
+
+        old, self.servers = self.servers, servers
+        self.close_servers([entry for entry in old if entry is not kept])
+
+    @staticmethod
+    def close_servers(servers: list):
+        for server, address, inode in servers:
+            server.close()
+            if inode is not None: #A unix socket
+                with contextlib.suppress(OSError):
+                    if os.stat(address).st_ino == inode: #Don't remove a newer server's socket
+                        os.unlink(address)
+
+    async def server_check_loop(self):
+        """
+        Checks the server in the background to keep the player history and channel topic up to date
 
-    async def server_check_loop(self): #This will be used to cache statuses later
-        check_time = 300
-        error_limit = 10
-        error_counter = 0
-        now = datetime.utcnow()
+        Checks happen every minute while the server is up. While it's down (or erroring) the delay doubles with each
+        failed check, up to 30 minutes, with some jitter so restarts don't line up. The channel topic is only edited
+        when its text changes and no more than once every 5 minutes, staying within Discord's channel edit limits.
+        """
+        failures = 0
+        last_sample = 0
+        last_edit = 0
         while self == self.bot.get_cog("SS13Status"):
             log.debug("Starting server checks")
-                     
-            channel = self.bot.get_channel(await self.config.new_round_channel())
-            toggle = await self.config.topic_toggle()
-            server = await self.config.server()
-            port = await self.config.game_port()
-            
-            if toggle is False or server is None or port is None or channel is None or error_counter < error_limit:
-                pass
-            else:
+            check_time = CHECK_INTERVAL
 
-                if channel.permissions_for(channel.guild.me).manage_channels is False:
-                    log.debug("Unable to set channel topic.")
+            profile = await self.get_profile()
+            if profile['host'] is not None and profile['port'] is not None:
+                try:
+                    status = await self.query_profile(profile)
+                except Exception as e:
+                    status = None
+                    log.warning(f"There was an error getting the server's status (attempt {failures + 1}).\n\nException:\n{e!r}")
+
+                if status is None:
+                    failures += 1
+                    backoff = min(CHECK_INTERVAL * (2 ** failures), MAX_CHECK_BACKOFF)
+                    check_time = random.uniform(backoff / 2, backoff)
+                else:
+                    failures = 0
+
+                if time.monotonic() - last_sample >= HISTORY_INTERVAL:
+                    self.record_history(status)
+                    last_sample = time.monotonic()
+
+                channel = self.bot.get_channel(await self.config.new_round_channel())
+                if await self.config.topic_toggle() is False or channel is None:
                     pass
+                elif channel.permissions_for(channel.guild.me).manage_channels is False:
+                    log.debug("Unable to set channel topic.")
+                elif time.monotonic() - last_edit < TOPIC_EDIT_INTERVAL:
+                    log.debug("Channel topic was edited recently, the update will wait for the next check.")
+                else:
+                    topic = self.render_topic(status, profile['server_url'])
+                    if topic != channel.topic:
+                        try:
+                            await channel.edit(topic=topic)
+                            last_edit = time.monotonic()
+                        except discord.DiscordException as e:
+                            log.warning(f"Unable to update the channel topic: {e}")
+
+            next_check = datetime.utcfromtimestamp(datetime.utcnow().timestamp() + check_time)
+            log.debug("Done. Next check at {}".format(next_check.strftime("%Y-%m-%d %H:%M:%S")))
+            await asyncio.sleep(check_time)
+
+    @staticmethod
+    def render_topic(status: StatusSnapshot, server_url: str) -> str:
+        if status is None:
+            return f"Server info for <{server_url}>: Offline"
+
+        duration = time.strftime('%H:%M', time.gmtime(status.round_duration))
+        return f"Server info for <{server_url}>: Players: {status.players} | Map: {str.title(status.map_name)} | Security Level: {str.title(status.security_level)} | Round Duration: {duration}"
+
+    async def player_tracker_loop(self):
+        """
+        Posts players joining and leaving the server by comparing each player list with the last one
+        """
+        previous = None
+        while True:
+            interval = 60
+            try:
+                settings = await self.settings()
+                interval = settings['join_leave_interval']
+                channel = self.bot.get_channel(settings['join_leave_channel'])
+                if channel is None or settings['server'] is None or settings['game_port'] is None:
+                    previous = None
+                    self.player_sessions.clear()
                 else:
                     try:
-                        topic_system = await self.config.legacy_topics()
-                        status = await self.query_server(server, port, legacy=topic_system)
+                        data = await self.query_profile(await self.get_profile(), "?whoIs")
                     except Exception as e:
-                        error_counter = error_counter + 1
-                        if error_counter < error_limit:
-                            check_time = check_time + 300
-                            log.warning(f"There was an error getting the server's status. Attempting again in {check_time}. Error {error_counter} of {error_limit} before disabling checks.\n\nException:\n{e}")
-                            await asyncio.sleep(check_time)
-                            continue
-                        else:
-                            log.warning(f"Exceeded the number of status errors. Disabling server checks.\n\nException:\n{e}")
-                            break
+                        log.debug(f"Unable to check the player list for joins and leaves:\n{e!r}")
+                        data = None
 
-                    if status is not None:
-                        duration = int(*status['round_duration'])
-                        duration = time.strftime('%H:%M', time.gmtime(duration))
-                        topic = f"Server info for <{await self.config.server_url()}>: Players: {status['players'][0]} | Map: {str.title(*status['map_name'])} | Security Level: {str.title(*status['security_level'])} | Round Duration: {duration}"
+                    if not data or 'players' not in data: #Offline, start fresh when it comes back
+                        previous = None
+                        self.player_sessions.clear()
                     else:
-                        topic = f"Server info for <{await self.config.server_url()}>: Offline" 
+                        current = set(map(str, data['players']))
+                        now = time.time()
+                        if previous is None: #Don't announce everyone who was already online
+                            self.player_sessions = dict.fromkeys(current, now)
+                        else:
+                            await self.announce_joins_leaves(channel, current - previous, previous - current, now)
+                        previous = current
+            except Exception as e:
+                log.exception(f"There was an error checking for players joining and leaving: {e}")
 
-                    await channel.edit(topic=topic)
+            await asyncio.sleep(interval)
 
-            now = datetime.utcnow()
-            next_check = datetime.utcfromtimestamp(now.timestamp() + check_time)
-            log.debug("Done. Next check at {}".format(next_check.strftime("%Y-%m-%d %H:%M:%S")))
-            check_time = 300
-            error_counter = 0
-            await asyncio.sleep(check_time)
+    async def announce_joins_leaves(self, channel: discord.TextChannel, joined: set, left: set, now: float):
+        if not joined and not left:
+            return
+
+        lines = []
+        if joined:
+            lines.append(f"**Joined ({len(joined)}):** {', '.join(sorted(joined))}")
+            for ckey in joined:
+                self.player_sessions[ckey] = now
+        if left:
+            sessions = []
+            for ckey in sorted(left):
+                started = self.player_sessions.pop(ckey, None)
+                sessions.append(f"{ckey} ({humanize_timedelta(seconds=now - started) or 'under a second'})" if started is not None else ckey)
+            lines.append(f"**Left ({len(left)}):** {', '.join(sessions)}")
+
+        try:
+            for page in pagify("\n".join(lines), delims=["\n", ", "]):
+                await channel.send(page, allowed_mentions=discord.AllowedMentions.none())
+        except discord.DiscordException as e:
+            log.warning(f"Unable to post player joins and leaves: {e}")
+
+    async def status_board_loop(self):
+        """
+        Keeps every status board up to date, querying the server once per update no matter how many boards there are
+        """
+        while True:
+            interval = 60
+            try:
+                settings = await self.settings()
+                interval = settings['board_interval']
+                if settings['status_boards']:
+                    embed = await self.status_embed(await self.get_profile(), await self.board_status())
+                    embed.set_footer(text=f"Updates every {settings['board_interval']} seconds")
+                    embed.timestamp = discord.utils.utcnow()
+                    await asyncio.gather(*(
+                        self.update_board(int(channel_id), message_id, embed) for channel_id, message_id in settings['status_boards'].items()
+                    ))
+            except Exception as e:
+                log.exception(f"There was an error updating the status boards: {e}")
+
+            await asyncio.sleep(interval)
+
+    async def board_status(self) -> StatusSnapshot:
+        profile = await self.get_profile()
+        if profile['host'] is None or profile['port'] is None:
+            return None
+        try:
+            return await self.query_profile(profile)
+        except Exception as e:
+            log.debug(f"Unable to get the server's status for the status boards:\n{e!r}")
+            return None
+
+    async def update_board(self, channel_id: int, message_id: int, embed: discord.Embed):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            return
+        try:
+            await channel.get_partial_message(message_id).edit(embed=embed)
+        except discord.NotFound: #Someone deleted the board, put it back
+            try:
+                await self.post_board(channel, embed)
+            except discord.DiscordException as e:
+                log.warning(f"Unable to replace the status board in {channel}: {e}")
+        except discord.DiscordException as e:
+            log.warning(f"Unable to update the status board in {channel}: {e}")
+        except Exception as e: #e.g. the connection to Discord dropping, the next update will try again
+            log.warning(f"Unable to update the status board in {channel}: {e!r}")
+
+    async def post_board(self, channel: discord.TextChannel, embed: discord.Embed) -> discord.Message:
+        """
+        Sends a new status board to the channel and pins it
+        """
+        message = await channel.send(embed=embed)
+        try:
+            await message.pin()
+        except discord.DiscordException:
+            log.debug(f"Unable to pin the status board in {channel}")
+        async with self.config.status_boards() as boards:
+            boards[str(channel.id)] = message.id
+        self.cached_settings = None
+        return message
+
+    def record_history(self, status: StatusSnapshot):
+        """
+        Adds the latest status check to the player history
+        """
+        if status is None:
+            self.history.record(time.time(), online=False)
+        else:
+            self.history.record(time.time(), status.players, status.admins, status.round_duration)
@@ -0,0 +1,268 @@
+"""
+Ingestion benchmark for the status cog's game event listener
+
+Replays synthetic (or recorded) game traffic against SS13Status.data_handler at a target rate over a few
+keep-alive connections. Discord is replaced by a stub channel that records every API call, so the report shows
+events/sec absorbed, end-to-end latency from the game's request to the Discord call, and Discord calls per event.
+
+Requires Red (and discord.py) to be installed, but doesn't connect to Discord or touch Red's data.
+
+    python tools/bench_listener.py --rate 500 --duration 10 --connections 4
+    python tools/bench_listener.py --replay recorded_requests.txt --discord-latency 150
+
+Recorded traffic is a text file with one request target per line, e.g. `/?key=...&announce_channel=admin&announce=...`
+"""
+import argparse
+import asyncio
+import collections
+import os
+import pathlib
+import random
+import re
+import sys
+import tempfile
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from redbot.core import Config  # noqa: E402
+
+COMMS_KEY = "bench"
+CHANNELS = {"new_round_channel": 1001, "admin_notice_channel": 1002, "mentor_notice_channel": 1003}
+MARKER = re.compile(r"bench(\d+)")
+
+
+class MemoryValue:
+    def __init__(self, store: dict, key: str):
+        self.store = store
+        self.key = key
+
+    async def _get(self):
+        return self.store[self.key]
+
+    def __call__(self):
+        return self._get()
+
+    async def set(self, value):
+        self.store[self.key] = value
+
+
+class MemoryConfig:
+    """
+    Just enough of Red's Config for the cog to run against in-memory settings
+    """
+
+    def __init__(self):
+        self.store = {}
+
+    def register_global(self, **defaults):
+        self.store.update(defaults)
+
+    def register_guild(self, **defaults):
+        pass
+
+    def __getattr__(self, key):
+        return MemoryValue(self.store, key)
+
+    async def all(self):
+        return dict(self.store)
+
+    async def all_guilds(self):
+        return {}
+
+
+class FakeMessage:
+    async def delete(self):
+        pass
+
+    async def edit(self, **kwargs):
+        pass
+
+
+class FakeGuild:
+    roles = []
+
+    def get_role(self, role_id):
+        return None
+
+
+class FakeChannel:
+    """
+    Records each call that would have gone to Discord, along with when it was made
+    """
+
+    def __init__(self, channel_id: int, sink, latency: float):
+        self.id = channel_id
+        self.guild = FakeGuild()
+        self.sink = sink
+        self.latency = latency
+
+    def __str__(self):
+        return f"bench-{self.id}"
+
+    async def send(self, content=None, *, embed=None, embeds=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.sink.record(content, [embed] if embed is not None else (embeds or []))
+        return FakeMessage()
+
+
+class DiscordSink:
+    def __init__(self):
+        self.calls = 0
+        self.delivered = {} #sequence: time delivered
+
+    def record(self, content, embeds):
+        self.calls += 1
+        now = time.perf_counter()
+        texts = [content or ""]
+        for embed in embeds:
+            texts += [embed.title or "", embed.description or "", embed.footer.text or ""]
+        for match in MARKER.finditer(" ".join(texts)):
+            self.delivered.setdefault(int(match.group(1)), now)
+
+
+class FakeBot:
+    def __init__(self, channels: dict):
+        self.loop = asyncio.get_running_loop()
+        self.channels = channels
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def get_cog(self, name):
+        return None #Stops the cog's background server checks
+
+
+def synthetic_event(seq: int) -> str:
+    kind = random.choices(("admin_ticket", "mentor_ticket", "admin_notice", "server_start"), (60, 25, 14, 1))[0]
+    if kind == "server_start":
+        data = {"serverStart": 1, "roundID": f"bench{seq}"}
+    elif kind == "admin_ticket":
+        data = {"announce_channel": "admin", "announce": f"Ticket #bench{seq} created by player (Player Name): I need help with something"}
+    elif kind == "mentor_ticket":
+        data = {"announce_channel": "mentor", "announce": f"Mentorhelp #bench{seq} from player (Player Name): How do I use the chem dispenser?"}
+    else:
+        data = {"announce_channel": "admin", "announce": f"The supermatter has just delaminated. #bench{seq}"}
+    data["key"] = COMMS_KEY
+    return "/?" + urllib.parse.urlencode(data)
+
+
+def replayed_event(targets: list, seq: int) -> str:
+    target = targets[seq % len(targets)]
+    split = urllib.parse.urlsplit(target)
+    params = urllib.parse.parse_qs(split.query, keep_blank_values=True)
+    params["key"] = [COMMS_KEY]
+    if "announce" in params:
+        params["announce"] = [f"{params['announce'][0]} #bench{seq}"]
+    if "serverStart" in params:
+        params["roundID"] = [f"bench{seq}"]
+    return "/?" + urllib.parse.urlencode(params, doseq=True)
+
+
+def build_cog(latency: float):
+    from status import ss13status
+
+    Config.get_conf = classmethod(lambda cls, *args, **kwargs: MemoryConfig())
+    data_path = tempfile.mkdtemp(prefix="ss13status-bench-")
+    ss13status.cog_data_path = lambda *args, **kwargs: pathlib.Path(data_path)
+    sink = DiscordSink()
+    bot = FakeBot({})
+    cog = ss13status.SS13Status(bot)
+    for setting, channel_id in CHANNELS.items():
+        cog.config.store[setting] = channel_id
+        bot.channels[channel_id] = FakeChannel(channel_id, sink, latency)
+    cog.config.store["comms_key"] = COMMS_KEY
+    cog.config.store["listen_port"] = 0 #Keep the cog's own listener out of the way
+    return cog, sink
+
+
+def percentile(values: list, q: float) -> float:
+    return values[min(int(q * len(values)), len(values) - 1)] if values else float("nan")
+
+
+async def run(args):
+    cog, sink = build_cog(args.discord_latency / 1000)
+    server = await asyncio.start_server(cog.data_handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    targets = None
+    if args.replay:
+        with open(args.replay) as f:
+            targets = [line.strip() for line in f if line.strip()]
+
+    sent = {} #sequence: time sent
+    responses = collections.Counter()
+    total = int(args.rate * args.duration)
+    interval = args.connections / args.rate
+    started = time.perf_counter()
+
+    async def connection(index: int):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def read_responses(expected: int):
+            for handled in range(expected):
+                line = await reader.readline()
+                if not line:
+                    responses["closed"] += expected - handled
+                    return
+                responses[line.split(b" ")[1].decode()] += 1
+                length = 0
+                while (header := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = header.decode().partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+
+        count = len(range(index, total, args.connections))
+        responder = asyncio.ensure_future(read_responses(count))
+        for n, seq in enumerate(range(index, total, args.connections)):
+            delay = started + n * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            target = replayed_event(targets, seq) if targets else synthetic_event(seq)
+            sent[seq] = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+        await writer.drain()
+        try:
+            await asyncio.wait_for(responder, 30)
+        except asyncio.TimeoutError:
+            responder.cancel()
+        writer.close()
+
+    await asyncio.gather(*(connection(i) for i in range(args.connections)))
+    ingested = time.perf_counter() - started
+
+    #Give the delivery worker a chance to flush anything still queued
+    deadline = time.perf_counter() + args.drain
+    while len(sink.delivered) < len(sent) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.1)
+
+    server.close()
+    cog.cog_unload()
+    await cog.eventlog.close()
+
+    latencies = sorted(sink.delivered[seq] - sent[seq] for seq in sink.delivered if seq in sent)
+    print(f"Events sent:        {len(sent)} over {args.connections} connection(s) in {ingested:.2f}s (target {args.rate}/s)")
+    print(f"Ingestion rate:     {responses.get('200', 0) / ingested:.1f} accepted events/sec")
+    print(f"Responses:          {', '.join(f'{k}: {v}' for k, v in sorted(responses.items()))}")
+    print(f"Delivered:          {len(latencies)} of {len(sent)} events reached the Discord stub")
+    print("Latency (ms):       " + "  ".join(f"p{int(q * 100)}={percentile(latencies, q) * 1000:.1f}" for q in (0.5, 0.9, 0.99)) + f"  max={(latencies[-1] * 1000 if latencies else float('nan')):.1f}")
+    print(f"Discord API calls:  {sink.calls} ({sink.calls / max(len(sent), 1):.3f} per event)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=200, help="Events per second to send")
+    parser.add_argument("--duration", type=float, default=5, help="Seconds to send events for")
+    parser.add_argument("--connections", type=int, default=2, help="Keep-alive connections to spread events over")
+    parser.add_argument("--replay", help="Replay request targets from a file instead of generating synthetic traffic")
+    parser.add_argument("--discord-latency", type=float, default=0, help="Milliseconds each stubbed Discord call takes")
+    parser.add_argument("--drain", type=float, default=10, help="Seconds to wait for queued notifications after sending")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Load test for the topic client used by the status (query_server) and verification (check_ckey) cogs
+
+Sends the same topic requests the cogs do at a fixed concurrency, then reports throughput, latency percentiles,
+and failures. Runs against tools/fake_byond.py in-process by default, or any server given with --host/--port.
+
+    python tools/bench_topic.py --requests 5000 --concurrency 50 --query whoIs --players 150
+    python tools/bench_topic.py --host 127.0.0.1 --port 7777 --duration 30
+"""
+import argparse
+import asyncio
+import collections
+import importlib.util
+import json
+import os
+import sys
+import time
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_byond import FakeByond  # noqa: E402
+
+
+def load_topic_client():
+    #Loaded straight from the file so the benchmark doesn't need Red installed
+    spec = importlib.util.spec_from_file_location("topic", os.path.join(ROOT, "status", "topic.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_query(query: str, json_topics: bool, comms_key: str) -> str:
+    """
+    Builds the same query strings as SS13Status.query_server and VerifyCkey.check_ckey
+    """
+    if query == "identify_uuid":
+        if json_topics:
+            return json.dumps({"auth": comms_key, "query": "identify_uuid", "uuid": "bench", "source": "Redbot - VerifyCkey"})
+        return f"?key={comms_key}&identify_uuid&uuid=bench"
+    if json_topics:
+        return json.dumps({"auth": comms_key, "query": query, "source": "Redbot - ss13Status"})
+    return f"?{query}"
+
+
+def decode(data: bytes, json_topics: bool):
+    if json_topics:
+        return json.loads(data.decode())['data']
+    return urllib.parse.parse_qs(data.decode())
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return float("nan")
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+async def run(args):
+    topic = load_topic_client()
+    server = None
+    if args.host is None:
+        fake = FakeByond(
+            json_topics=args.json, players=args.players, latency=args.latency / 1000, jitter=args.jitter / 1000,
+            fail_rate=args.fail_rate, comms_key=args.comms_key
+        )
+        server = await fake.start()
+        host, port = server.sockets[0].getsockname()[:2]
+    else:
+        host, port = args.host, args.port
+
+    querystr = build_query(args.query, args.json, args.comms_key)
+    latencies = []
+    errors = collections.Counter()
+    issued = 0
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    async def worker():
+        nonlocal issued
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+            elif issued >= args.requests:
+                return
+            issued += 1
+
+            start = time.perf_counter()
+            try:
+                decode(await topic.topic_query(host, port, querystr, args.timeout), args.json)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors[type(e).__name__] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    if server is not None:
+        server.close()
+
+    latencies.sort()
+    total = len(latencies) + sum(errors.values())
+    print(f"Target:       {host}:{port} ({'JSON' if args.json else 'legacy'} topics, ?{args.query})")
+    print(f"Requests:     {total} in {elapsed:.2f}s at concurrency {args.concurrency}")
+    print(f"Throughput:   {len(latencies) / elapsed:.1f} successful requests/sec")
+    print("Latency (ms): " + "  ".join(f"p{int(q * 100)}={percentile(latencies, q) * 1000:.2f}" for q in (0.5, 0.9, 0.95, 0.99)) + f"  max={(latencies[-1] * 1000 if latencies else float('nan')):.2f}")
+    print(f"Failures:     {sum(errors.values())}" + (f" ({', '.join(f'{k}: {v}' for k, v in errors.most_common())})" if errors else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", help="Benchmark an existing server instead of starting a fake one")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--query", default="status", choices=("status", "whoIs", "getAdmins", "identify_uuid"))
+    parser.add_argument("--json", action="store_true", help="Use the JSON topic system instead of the legacy system")
+    parser.add_argument("--comms-key", default="default_pwd")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead of a fixed number of requests")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--players", type=int, default=40, help="(Fake server) players reported")
+    parser.add_argument("--latency", type=float, default=0, help="(Fake server) milliseconds of latency")
+    parser.add_argument("--jitter", type=float, default=0, help="(Fake server) milliseconds of latency jitter")
+    parser.add_argument("--fail-rate", type=float, default=0, help="(Fake server) fraction of requests that fail")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Stand-in BYOND world/Topic server for testing the status and verification cogs offline
+
+Answers ?status, ?whoIs, ?getAdmins and identify_uuid topics in either the legacy (query string) or JSON format,
+with configurable latency, player count, and failure injection.
+
+    python tools/fake_byond.py --port 7777 --players 120 --latency 50 --jitter 25 --fail-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+import struct
+import urllib.parse
+
+FAILURES = ("drop", "hang", "garbage", "truncate")
+
+
+class FakeByond:
+    def __init__(self, json_topics: bool = False, players: int = 40, admins: int = 3, latency: float = 0, jitter: float = 0,
+                 fail_rate: float = 0, failures: tuple = FAILURES, comms_key: str = "default_pwd"):
+        self.json_topics = json_topics
+        self.players = players
+        self.admins = admins
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.failures = failures
+        self.comms_key = comms_key
+        self.served = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader, writer):
+        try:
+            header = await reader.readexactly(4)
+            body = await reader.readexactly(struct.unpack('>H', header[2:])[0])
+            querystr = body[5:-1].decode()
+
+            delay = self.latency + random.uniform(-self.jitter, self.jitter)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            failure = random.choice(self.failures) if self.failures and random.random() < self.fail_rate else None
+            if failure == "drop":
+                return
+            if failure == "hang":
+                try:
+                    await asyncio.sleep(3600)
+                except asyncio.CancelledError:
+                    pass #The server is shutting down
+                return
+            if failure == "garbage":
+                writer.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+                return
+
+            payload = self.respond(querystr)
+            packet = b"\x00\x83" + struct.pack('>H', len(payload) + 2) + b"\x06" + payload + b"\x00"
+            if failure == "truncate":
+                packet = packet[:len(packet) // 2]
+            writer.write(packet)
+            await writer.drain()
+            self.served += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, querystr: str) -> bytes:
+        if self.json_topics:
+            try:
+                request = json.loads(querystr)
+            except json.JSONDecodeError:
+                return b"" #A real server would ignore a legacy topic sent to the JSON system
+            query, params = request.get("query", ""), request
+        else:
+            params = {k: v[0] for k, v in urllib.parse.parse_qs(querystr.lstrip("?"), keep_blank_values=True).items()}
+            query = next(iter(params), "")
+            if "identify_uuid" in params:
+                query = "identify_uuid"
+
+        if query == "status":
+            data = {
+                "version": "/tg/ Station 13", "mode": "secret", "respawn": 0, "enter": 1, "vote": 1, "ai": 1,
+                "host": "", "active_players": self.players, "players": self.players, "revision": "fake",
+                "revision_date": "2020-01-01", "admins": self.admins, "gamestate": 3, "map_name": "Box Station",
+                "security_level": "green", "round_duration": random.randint(0, 7200), "shuttle_mode": "idle",
+                "shuttle_timer": 0,
+            }
+        elif query == "whoIs":
+            data = {"players": [f"player{i}" for i in range(self.players)]}
+        elif query == "getAdmins":
+            data = {"admins": [f"admin{i}" for i in range(self.admins)]}
+        elif query == "identify_uuid":
+            key = params.get("auth" if self.json_topics else "key")
+            if key != self.comms_key:
+                data = {"error": "Bad key"}
+            else:
+                data = {"identified_ckey": f"ckey{abs(hash(params.get('uuid'))) % 10000}"}
+        else:
+            data = {}
+
+        if self.json_topics:
+            return json.dumps({"statuscode": 200, "response": "ok", "data": data}).encode()
+        return urllib.parse.urlencode(data, doseq=True).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--json", action="store_true", help="Respond using the JSON topic system instead of the legacy system")
+    parser.add_argument("--players", type=int, default=40, help="Number of players reported (controls the ?whoIs payload size)")
+    parser.add_argument("--admins", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0, help="Milliseconds to wait before responding")
+    parser.add_argument("--jitter", type=float, default=0, help="Random +/- milliseconds added to the latency")
+    parser.add_argument("--fail-rate", type=float, default=0, help="Fraction (0-1) of requests that fail")
+    parser.add_argument("--failures", default=",".join(FAILURES), help=f"Comma separated failure types to inject ({', '.join(FAILURES)})")
+    parser.add_argument("--comms-key", default="default_pwd")
+    args = parser.parse_args()
+
+    fake = FakeByond(
+        json_topics=args.json, players=args.players, admins=args.admins, latency=args.latency / 1000,
+        jitter=args.jitter / 1000, fail_rate=args.fail_rate, failures=tuple(f for f in args.failures.split(",") if f),
+        comms_key=args.comms_key
+    )
+
+    async def serve():
+        server = await fake.start(args.host, args.port)
+        print(f"Fake BYOND server listening on {args.host}:{args.port} ({'JSON' if args.json else 'legacy'} topics)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
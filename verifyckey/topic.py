@@ -0,0 +1,85 @@
+import asyncio
+import struct
+import time
+
+RESPONSE_NULL = 0x00
+RESPONSE_FLOAT = 0x2a
+RESPONSE_STRING = 0x06
+
+
+def build_packet(querystr: str) -> bytes:
+    """
+    Creates a packet for byond according to TG's standard
+    """
+    return b"\x00\x83" + struct.pack('>H', len(querystr) + 6) + b"\x00\x00\x00\x00\x00" + querystr.encode() + b"\x00"
+
+
+async def read_response(reader: asyncio.StreamReader, timings: dict = None) -> bytes:
+    """
+    Reads a single topic response and returns its payload
+
+    Byond prefixes each response with a 4 byte header (\\x00\\x83 followed by the payload length), so the
+    payload is read in full no matter how many segments it arrives in. String payloads are returned without
+    their type byte and null terminator, floats are returned as their text representation.
+    """
+    start = time.perf_counter()
+    header = await reader.readexactly(4)
+    if timings is not None:
+        timings['first_byte'] = time.perf_counter() - start
+    if header[1] != 0x83:
+        raise ValueError(f"Unexpected topic response header: {header!r}")
+    length = struct.unpack('>H', header[2:])[0]
+
+    buffer = bytearray(length)
+    view = memoryview(buffer)
+    received = 0
+    while received < length:
+        chunk = await reader.read(length - received)
+        if not chunk:
+            raise asyncio.IncompleteReadError(bytes(view[:received]), length)
+        view[received:received + len(chunk)] = chunk
+        received += len(chunk)
+    if timings is not None:
+        timings['receive'] = time.perf_counter() - start - timings['first_byte']
+
+    if length == 0 or buffer[0] == RESPONSE_NULL:
+        return b""
+    if buffer[0] == RESPONSE_FLOAT:
+        if length < 5:
+            raise ValueError(f"Truncated float topic response: {bytes(buffer)!r}")
+        return str(struct.unpack('<f', view[1:5])[0]).encode()
+    if buffer[0] != RESPONSE_STRING:
+        raise ValueError(f"Unknown topic response type: {buffer[0]:#x}")
+
+    end = length - 1 if buffer[-1] == 0 else length
+    return bytes(view[1:end])
+
+
+async def _exchange(host: str, port: int, packet: bytes, timings: dict = None) -> bytes:
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    connected = time.perf_counter()
+    try:
+        writer.write(packet)
+        await writer.drain()
+        if timings is not None:
+            timings['connect'] = connected - start
+            timings['send'] = time.perf_counter() - connected
+
+        return await read_response(reader, timings)
+    finally:
+        writer.close()
+
+
+async def topic_query(host: str, port: int, querystr: str, timeout: float, timings: dict = None) -> bytes:
+    """
+    Sends a topic request to a byond server and returns the response's payload
+
+    The timeout is a deadline for the entire exchange (connect, send, and receive). Raises asyncio.TimeoutError
+    if the deadline passes, OSError (e.g. ConnectionRefusedError) if the server can't be reached, and
+    ValueError if the response is malformed.
+
+    If a timings dict is provided, it's filled with the time (in seconds) spent on each phase of the exchange:
+    connect, send, first_byte, and receive.
+    """
+    return await asyncio.wait_for(_exchange(host, port, build_packet(querystr), timings), timeout)
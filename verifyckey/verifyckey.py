@@ -1,8 +1,6 @@
 #Standard Imports
 import asyncio
 from json.decoder import JSONDecodeError
-import socket
-import struct
 import urllib.parse
 import logging
 import json
@@ -16,6 +14,9 @@ from redbot.core import commands, checks, Config
 from redbot.core.utils.chat_formatting import humanize_list
 from redbot.core.utils.predicates import MessagePredicate
 
+#Util Imports
+from .topic import topic_query
+
 __version__ = "1.1.0"
 __author__ = "Crossedfall"
 
@@ -302,7 +303,7 @@ class VerifyCkey(commands.Cog):
                         await ctx.send(embed=embed)
                     else:
                         await ctx.send(f"That identifier doesn't seem to exist. Please check the steps in `{ctx.prefix}verify` and try again.")
-                except (ConnectionRefusedError, socket.gaierror, socket.timeout, TimeoutError):
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
                     await ctx.send("There was an error connecting to the server! Please try again later. If the problem persists, contact an admin.")
                 except (discord.errors.Forbidden, discord.errors.HTTPException):
                     await ctx.send("I was unable to add your role. Please contact an admin asking them to check my permissions.")
@@ -357,8 +358,6 @@ class VerifyCkey(commands.Cog):
         Verify the uuid with the server
         """
         try:
-            conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM) 
-
             if legacy or legacy is None: # The updated topic system uses json whereas the legacy system uses standard URI formatting
                 querystr = f"?key={await self.config.comms_key()}&identify_uuid&uuid={uuid}"
             else:
@@ -369,31 +368,26 @@ class VerifyCkey(commands.Cog):
                     "source": "Redbot - VerifyCkey"
                 })
 
-            query = b"\x00\x83" + struct.pack('>H', len(querystr) + 6) + b"\x00\x00\x00\x00\x00" + querystr.encode() + b"\x00" #Creates a packet for byond according to TG's standard
-            conn.settimeout(30) #Byond is slow, timeout set relatively high to account for any latency
-            conn.connect((await self.config.game_server(), await self.config.game_port())) 
-
-            conn.sendall(query)
-
-            data = conn.recv(4096) #Minimum number should be 4096, anything less will lose data
+            #Byond is slow, timeout set relatively high to account for any latency
+            data = await topic_query(await self.config.game_server(), await self.config.game_port(), querystr, 30)
 
             if legacy or legacy is None:
-                parsed_data = urllib.parse.parse_qs(data[5:-1].decode())
+                parsed_data = urllib.parse.parse_qs(data.decode())
             else:
-                parsed_data = json.loads(data[5:-1].decode())
+                parsed_data = json.loads(data.decode())
                 if 'data' not in parsed_data:
                     raise LookupError(f"Bad response from server {parsed_data}")
 
             return parsed_data
-        except (ConnectionRefusedError, socket.gaierror, socket.timeout, TimeoutError, LookupError) as e:
-            log.warning(f"Unable to obtain CKEY information:\n{e}")
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, LookupError) as e:
+            log.warning(f"Unable to obtain CKEY information:\n{e!r}")
             raise e #Server is likely offline or using a different topic system
         except json.JSONDecodeError:
             log.warning(f"Unable to communicate with the server. It looks like we're sending updated topic requests but the server is expecting legacy requests.")
             raise LookupError("A JSON request sent, but one was not returned. Verify that the correct topic system is set.")
-
-        finally:
-            conn.close()
+        except ValueError as e:
+            log.warning(f"Unable to decode the server's response:\n{e}")
+            raise LookupError(f"Bad response from server: {e}")
     
     @commands.Cog.listener()
     async def on_member_remove(self, member):